@@ -1,10 +1,6 @@
 #!/bin/bash
 
-# Loop through all FBX files in the current directory
-for f in *.fbx; do
-  echo "Processing $f..."
-  # Use Blender in background mode, open a blank file, run your script, and then quit
-  blender -b --python uv_rescale.py -- "$f"
-  # Optionally, you can add commands to export the processed file to FBX again
-  # This step may require adjusting your rescale_uv.py script to include export functionality
-done
+# Rescale the UVs of all FBX files in the current directory in one Blender session,
+# saving each result as <name>_rescaled.fbx
+echo "Processing *.fbx..."
+blender -b --factory-startup -P ../../blender-batch.py -- -o uv_rescale -p scale=0.5 --suffix _rescaled *.fbx
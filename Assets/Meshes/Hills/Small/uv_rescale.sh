@@ -1,6 +1,14 @@
 #!/bin/bash
 
-for file in *.blend; do
-    blender -b "$file" -P uv_rescale.py
-done
+# Path to the Blender executable; adjust as needed
+BLENDER_PATH="blender"
 
+# Batch worker that processes all files in one Blender session
+BATCH_SCRIPT="../../blender-batch.py"
+
+# Scale the UVs of the selected meshes by 0.5 in all blend files in the current
+# directory, with the same colour management override as uv_rescale.py, and save them
+echo "Processing *.blend..."
+$BLENDER_PATH -b --factory-startup -P "$BATCH_SCRIPT" -- -o uv_rescale -p scale=0.5 -p selected_only=true -p view_transform=Standard -p look=None *.blend
+
+echo "All files processed."
@@ -3,15 +3,11 @@
 # Path to the Blender executable; adjust as needed
 BLENDER_PATH="blender"
 
-# Path to your Python script
-SCRIPT_PATH="apply-scale.py"
+# Batch worker that processes all files in one Blender session
+BATCH_SCRIPT="../../blender-batch.py"
 
-# Find all blend files in the current directory and process them
-for blendfile in *.blend; do
-    echo "Processing $blendfile..."
-    $BLENDER_PATH -b "$blendfile" -P "$SCRIPT_PATH"
-    echo "$blendfile processed."
-done
+# Apply the scale of all blend files in the current directory and save them
+echo "Processing *.blend..."
+$BLENDER_PATH -b --factory-startup -P "$BATCH_SCRIPT" -- -o apply_scale *.blend
 
 echo "All files processed."
-
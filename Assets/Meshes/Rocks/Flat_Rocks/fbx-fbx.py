@@ -1,5 +1,11 @@
-import bpy
 import os
+import sys
+
+import bpy
+
+# uv_transform.py lives in Assets/Meshes
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from uv_transform import transform_object_uvs
 
 def clear_scene():
     # Clear existing objects in the scene
@@ -9,15 +15,7 @@ def clear_scene():
 def rescale_uvs(scale_factor=64):
     for obj in bpy.context.scene.objects:
         if obj.type == 'MESH':
-            bpy.context.view_layer.objects.active = obj
-            bpy.ops.object.select_all(action='DESELECT')
-            obj.select_set(True)
-            bpy.ops.object.mode_set(mode='EDIT')
-            for uvmap in obj.data.uv_layers:
-                for data in uvmap.data:
-                    data.uv[0] *= scale_factor  # Scale U coordinate
-                    data.uv[1] *= scale_factor  # Scale V coordinate
-            bpy.ops.object.mode_set(mode='OBJECT')
+            transform_object_uvs(obj, scale=scale_factor)
 
 def import_and_reexport_fbx(fbx_file_path, scale_factor=64):
     # Clear the current scene
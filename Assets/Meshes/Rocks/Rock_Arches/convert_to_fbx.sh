@@ -1,6 +1,4 @@
 #!/bin/bash
 
-for file in *.blend; do
-    blender -b "$file" -P convert_to_fbx.py
-done
-
+# Apply the scale of all blend files and export them to exported_fbx/, in one Blender session
+blender -b --factory-startup -P ../../blender-batch.py -- -o apply_scale --format .fbx --output-dir exported_fbx *.blend
@@ -6,17 +6,14 @@ if ! command -v blender &> /dev/null; then
     exit 1
 fi
 
-# Check if the decimate.py script exists
-if [ ! -f "decimate.py" ]; then
-    echo "The decimate.py script is not found in the current directory."
+# Check if the batch worker exists
+if [ ! -f "../../blender-batch.py" ]; then
+    echo "The blender-batch.py script is not found in Assets/Meshes."
     exit 1
 fi
 
-# Loop through all .blend files in the current directory
-for blend_file in *.blend; do
-    # Run Blender with the decimate.py script
-    blender --background --python decimate.py "$blend_file"
-done
+# Decimate all .blend files in the current directory in one Blender session,
+# saving each result as <name>_decimated.blend
+blender --background --factory-startup --python ../../blender-batch.py -- -o decimate -p ratio=0.6 --suffix _decimated *.blend
 
 echo "Decimation process completed for all .blend files in the current directory."
-
@@ -19,27 +19,19 @@ def de_atlas_object(obj):
     # Dictionary to keep track of UV islands and the faces belonging to them
     islands = {}
 
-    # Function to check if a face is part of an existing island
-    def face_in_island(face, island):
-        for loop in face.loops:
-            uv = loop[uv_layer].uv
-            for other_face in island:
-                for other_loop in other_face.loops:
-                    other_uv = other_loop[uv_layer].uv
-                    if uv == other_uv:
-                        return True
-        return False
+    # Dictionary from each UV coordinate to the first island that has a face using it
+    island_of_uv = {}
 
-    # Identify UV islands
+    # Identify UV islands: a face joins the first island that shares one of its
+    # UVs, or starts a new one. Looking the UVs up in island_of_uv finds that
+    # island without comparing against the faces already placed.
     for face in mesh.faces:
-        added = False
-        for island in islands.values():
-            if face_in_island(face, island):
-                island.append(face)
-                added = True
-                break
-        if not added:
-            islands[len(islands)] = [face]
+        uvs = [tuple(loop[uv_layer].uv) for loop in face.loops]
+        island_index = min((island_of_uv[uv] for uv in uvs if uv in island_of_uv), default=len(islands))
+        islands.setdefault(island_index, []).append(face)
+        for uv in uvs:
+            if island_of_uv.get(uv, island_index) >= island_index:
+                island_of_uv[uv] = island_index
 
     # Create new materials and assign them to faces based on islands
     for island_index, island_faces in islands.items():
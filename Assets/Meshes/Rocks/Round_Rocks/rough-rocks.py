@@ -1,6 +1,14 @@
-import bpy
+import argparse
+import os
+import random
 import sys
 
+import bpy
+
+# displacement.py lives in Assets/Meshes
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from displacement import remove_displacement_helpers, setup_displacement
+
 def clear_scene():
     bpy.ops.object.select_all(action='SELECT')
     bpy.ops.object.delete()
@@ -8,35 +16,58 @@ def clear_scene():
 def import_fbx(file_path):
     bpy.ops.import_scene.fbx(filepath=file_path)
 
-def apply_displacement(displacement_strength=0.05):
-    for obj in bpy.context.scene.objects:
-        if obj.type == 'MESH':
-            bpy.context.view_layer.objects.active = obj
-            bpy.ops.object.modifier_add(type='DISPLACE')
-            modifier = obj.modifiers['Displace']
-            
-            # Create a new texture for the displacement modifier
-            texture = bpy.data.textures.new(name="DisplaceTex", type='CLOUDS')
-            modifier.texture = texture
-            modifier.strength = displacement_strength
-            
-            # Apply the modifier
-            bpy.ops.object.modifier_apply(modifier='Displace')
+# Function to roughen every mesh with a seeded clouds displacement (see displacement.py).
+# The meshes are listed before the loop, and the helper empties are only removed
+# after it, so the scene's objects do not change while they are iterated.
+def apply_displacement(displacement_strength=0.05, seed=0, noise_scale=0.25, noise_depth=2):
+    rng = random.Random(seed)
+    meshes = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+    helpers = []
+    for obj in meshes:
+        bpy.context.view_layer.objects.active = obj
+        bpy.ops.object.modifier_add(type='DISPLACE')
+        modifier = obj.modifiers['Displace']
+        helpers.append(setup_displacement(modifier, rng, displacement_strength, noise_scale, noise_depth))
+
+        # Apply the modifier
+        bpy.ops.object.modifier_apply(modifier='Displace')
+    remove_displacement_helpers(helpers)
 
 def export_fbx(file_path):
     bpy.ops.object.select_all(action='SELECT')
     bpy.ops.export_scene.fbx(filepath=file_path, use_selection=True)
 
+# Function to write seeded variants of the imported rocks: each variant starts
+# from a copy of the original meshes, so the file is only imported once
+def export_variants(output_file, variants, seed, strength, noise_scale, noise_depth):
+    meshes = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+    originals = {obj: obj.data for obj in meshes}
+    name, extension = os.path.splitext(output_file)
+    for variant in range(variants):
+        for obj in meshes:
+            obj.data = originals[obj].copy()
+        apply_displacement(strength, seed + variant, noise_scale, noise_depth)
+        variant_file = f"{name}_{variant + 1:02d}{extension}" if variants > 1 else output_file
+        export_fbx(variant_file)
+        print(f"Exported {variant_file} (seed {seed + variant})")
+        for obj in meshes:
+            displaced = obj.data
+            obj.data = originals[obj]
+            bpy.data.meshes.remove(displaced)
+
 if __name__ == "__main__":
     argv = sys.argv
-    argv = argv[argv.index("--") + 1:] if "--" in argv else argv
-    if len(argv) != 2:
-        print("Usage: blender -b -P script.py -- <input_fbx_file> <output_fbx_file>")
-        sys.exit(1)
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog="blender -b -P rough-rocks.py --", description="Roughen rocks with a seeded displacement.")
+    parser.add_argument("input_file")
+    parser.add_argument("output_file", help="output FBX; with --variants, _01, _02, ... are added to the name")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first variant; variant k uses seed + k (default: 0)")
+    parser.add_argument("--variants", type=int, default=1, help="number of variants to write (default: 1)")
+    parser.add_argument("--strength", type=float, default=0.05, help="displacement strength (default: 0.05)")
+    parser.add_argument("--noise-scale", type=float, default=0.25, help="size of the noise features (default: 0.25)")
+    parser.add_argument("--noise-depth", type=int, default=2, help="noise octaves (default: 2)")
+    args = parser.parse_args(argv)
 
-    input_file, output_file = argv
     clear_scene()
-    import_fbx(input_file)
-    apply_displacement(0.05)  # Adjust the displacement strength as needed
-    export_fbx(output_file)
-
+    import_fbx(args.input_file)
+    export_variants(args.output_file, args.variants, args.seed, args.strength, args.noise_scale, args.noise_depth)
@@ -1,17 +1,8 @@
 #!/bin/bash
 
-# Loop through all FBX files in the current directory
-for fbx_file in *.fbx; do
-    echo "Processing ${fbx_file}..."
-
-    # Construct the output filename
-    # This example adds "_modified" before the file extension. Adjust as needed.
-    output_file="${fbx_file%.fbx}.fbx"
-
-    # Run Blender in background mode, execute the Python script with the current FBX file
-    blender -b -P hipoly-rocks.py -- "${fbx_file}" "${output_file}"
-    blender -b -P rough-rocks.py -- "${fbx_file}" "${output_file}"
-done
+# Subdivide and then roughen all FBX files in the current directory, overwriting them.
+# All files are processed in one Blender session.
+echo "Processing *.fbx..."
+blender -b --factory-startup -P ../../blender-batch.py -- -o subdivide -o displace -p levels=1 -p strength=0.05 *.fbx
 
 echo "All files processed."
-
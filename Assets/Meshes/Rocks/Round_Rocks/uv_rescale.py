@@ -1,5 +1,12 @@
+import os
+import sys
+
 import bpy
 
+# uv_transform.py lives in Assets/Meshes
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from uv_transform import transform_object_uvs
+
 # Override color management settings
 bpy.context.scene.view_settings.view_transform = 'Standard'
 bpy.context.scene.view_settings.look = 'None'
@@ -8,13 +15,8 @@ bpy.context.scene.view_settings.look = 'None'
 for obj in bpy.context.selected_objects:
     # Ensure the object is a mesh
     if obj.type == 'MESH':
-        # Iterate through the UV maps
-        for uvmap in obj.data.uv_layers:
-            # Iterate through the UV map data
-            for data in uvmap.data:
-                # Scale each UV coordinate
-                data.uv[0] *= 2  # Scale U coordinate
-                data.uv[1] *= 2  # Scale V coordinate
+        # Scale the U and V coordinates of all UV maps
+        transform_object_uvs(obj, scale=2)
 
 # Save the modified file
 bpy.ops.wm.save_as_mainfile(filepath=bpy.data.filepath)
@@ -0,0 +1,364 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import bmesh
+import bpy
+from mathutils.bvhtree import BVHTree
+
+# Blender does not put the script's folder on the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from displacement import remove_displacement_helpers, setup_displacement
+from uv_transform import transform_object_uvs
+
+# Run inside Blender, once for a whole batch of meshes:
+#   blender -b --factory-startup -P blender-batch.py -- --manifest jobs.json
+#   blender -b --factory-startup -P blender-batch.py -- -o apply_scale *.blend
+#
+# A manifest is a JSON list of jobs (or {"jobs": [...]}); paths in it are
+# relative to the manifest. Each job is
+#   {"input": "Rock_01.fbx", "operation": "decimate", "parameters": {"ratio": 0.3}, "output": "Rock_01.blend"}
+# or, to chain operations on one import,
+#   {"input": "Rock_01.fbx", "operations": [{"operation": "subdivide"}, {"operation": "displace"}]}
+# The output defaults to the input, which is then overwritten. A step with a
+# "save" path also saves a copy of the scene as it is after that step.
+#
+# The lod operation turns every mesh into a chain of decimated copies named
+# <mesh>_LOD0, <mesh>_LOD1, ..., which Unity imports as a LOD group, e.g.
+#   blender -b --factory-startup -P blender-batch.py -- -o lod -p 'ratios=[1, 0.5, 0.25, 0.1]' --format .fbx --suffix _LOD *.blend
+# Next to each output it writes <output>.lods.json with the triangle count and
+# geometric error of every level, for the prefabs to pick distances from.
+
+# Data blocks an import can add; they are removed again after each job
+DATA_COLLECTIONS = ("objects", "meshes", "materials", "textures", "images", "armatures",
+                    "actions", "cameras", "lights", "curves", "collections", "node_groups")
+
+def mesh_objects():
+    return [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+
+# Function to select the given objects only, making the first one active
+def select_only(objects):
+    bpy.ops.object.select_all(action='DESELECT')
+    for obj in objects:
+        obj.select_set(True)
+    if objects:
+        bpy.context.view_layer.objects.active = objects[0]
+
+# Function to apply a modifier to every mesh (or the given objects), one object at a time
+def apply_modifier(kind, setup, objects=None):
+    for obj in mesh_objects() if objects is None else objects:
+        select_only([obj])
+        modifier = obj.modifiers.new(name=kind.title(), type=kind)
+        setup(obj, modifier)
+        bpy.ops.object.modifier_apply(modifier=modifier.name)
+
+# Operation: bake the object scale into the meshes (apply-scale.py, apply_scale_fbx.py)
+def apply_scale(parameters):
+    select_only(mesh_objects())
+    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+
+# Operation: scale every object and bake it in (scale_fbx_files.py)
+def scale(parameters):
+    factor = parameters.get("factor", 100.0)
+    objects = list(bpy.context.scene.objects)
+    for obj in objects:
+        obj.scale *= factor
+    select_only(objects)
+    bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
+
+# Operation: scale, rotate and offset the UVs of every mesh (uv_rescale.py, fbx-fbx.py).
+# With selected_only, only the meshes selected in the loaded file are changed, and
+# view_transform and look set the scene's colour management, as uv_rescale.py does.
+def uv_rescale(parameters):
+    u_scale = parameters.get("u_scale", parameters.get("scale", 0.5))
+    v_scale = parameters.get("v_scale", parameters.get("scale", 0.5))
+    view_settings = bpy.context.scene.view_settings
+    if "view_transform" in parameters:
+        view_settings.view_transform = parameters["view_transform"]
+    if "look" in parameters:
+        view_settings.look = parameters["look"]
+    objects = mesh_objects()
+    if parameters.get("selected_only", False):
+        objects = [obj for obj in objects if obj.select_get()]
+    for obj in objects:
+        transform_object_uvs(obj, scale=(u_scale, v_scale), offset=parameters.get("offset", (0.0, 0.0)),
+                             rotation=parameters.get("rotation", 0.0), pivot=parameters.get("pivot", (0.0, 0.0)))
+
+# Operation: reduce the face count with a Decimate modifier (decimate.py)
+def decimate(parameters):
+    ratio = parameters.get("ratio", 0.3)
+    apply_modifier('DECIMATE', lambda obj, modifier: setattr(modifier, "ratio", ratio))
+
+# Operation: subdivide every mesh (hipoly-rocks.py)
+def subdivide(parameters):
+    levels = parameters.get("levels", 1)
+    apply_modifier('SUBSURF', lambda obj, modifier: setattr(modifier, "levels", levels))
+
+# Operation: roughen every mesh with a seeded clouds displacement (rough-rocks.py)
+def displace(parameters):
+    rng = random.Random(parameters.get("seed", 0))
+    helpers = []
+    def setup(obj, modifier):
+        helpers.append(setup_displacement(modifier, rng, parameters.get("strength", 0.05),
+                                          parameters.get("noise_scale", 0.25), parameters.get("noise_depth", 2)))
+    apply_modifier('DISPLACE', setup)
+    remove_displacement_helpers(helpers)
+
+# Operation: give every UV island of every mesh its own material (deatlas-fbx.py)
+def deatlas(parameters):
+    for obj in mesh_objects():
+        select_only([obj])
+        bpy.ops.object.mode_set(mode='EDIT')
+        mesh = bmesh.from_edit_mesh(obj.data)
+        uv_layer = mesh.loops.layers.uv.active
+
+        # A face joins the first island that shares one of its UVs, or starts a new one
+        islands = []
+        island_of_uv = {}
+        for face in mesh.faces:
+            uvs = [tuple(loop[uv_layer].uv) for loop in face.loops]
+            island_index = min((island_of_uv[uv] for uv in uvs if uv in island_of_uv), default=len(islands))
+            if island_index == len(islands):
+                islands.append([])
+            islands[island_index].append(face)
+            for uv in uvs:
+                if island_of_uv.get(uv, island_index) >= island_index:
+                    island_of_uv[uv] = island_index
+
+        for island_index, island_faces in enumerate(islands):
+            mat_name = f"Material_{island_index}"
+            obj.data.materials.append(bpy.data.materials.get(mat_name) or bpy.data.materials.new(name=mat_name))
+            for face in island_faces:
+                face.material_index = island_index
+
+        bmesh.update_edit_mesh(obj.data)
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+def triangle_count(mesh):
+    return sum(polygon.loop_total - 2 for polygon in mesh.polygons)
+
+# Function to measure how far a decimated mesh strays from the original: the
+# distance from each original vertex to the nearest point of the decimated surface
+def geometric_error(original_points, mesh):
+    tree = BVHTree.FromPolygons([vertex.co for vertex in mesh.vertices], [tuple(polygon.vertices) for polygon in mesh.polygons])
+    distances = [tree.find_nearest(point)[3] or 0.0 for point in original_points]
+    return max(distances, default=0.0), sum(distances) / len(distances) if distances else 0.0
+
+# Operation: replace every mesh with a LOD chain, one decimated copy per ratio
+# (decimate.py makes a single level). Returns the levels of every mesh.
+def lod(parameters):
+    ratios = parameters.get("ratios", [1.0, 0.5, 0.25, 0.1])
+    chains = []
+    for obj in mesh_objects():
+        name = obj.name
+        original_points = [vertex.co.copy() for vertex in obj.data.vertices]
+        extent = [max(point[axis] for point in original_points) - min(point[axis] for point in original_points)
+                  for axis in range(3)] if original_points else [0.0]
+        diagonal = sum(length ** 2 for length in extent) ** 0.5
+
+        # Every level is decimated from the full mesh, not from the level before it
+        levels = []
+        for level, ratio in enumerate(ratios):
+            lod_obj = obj if level == 0 else obj.copy()
+            if level:
+                lod_obj.data = obj.data.copy()
+                for collection in obj.users_collection:
+                    collection.objects.link(lod_obj)
+            levels.append((lod_obj, ratio))
+        for level, (lod_obj, ratio) in enumerate(levels):
+            lod_obj.name = f"{name}_LOD{level}"
+            if ratio < 1.0:
+                apply_modifier('DECIMATE', lambda obj, modifier: setattr(modifier, "ratio", ratio), [lod_obj])
+
+        chain = []
+        for level, (lod_obj, ratio) in enumerate(levels):
+            max_error, mean_error = geometric_error(original_points, lod_obj.data) if ratio < 1.0 else (0.0, 0.0)
+            chain.append({"object": lod_obj.name, "ratio": ratio, "triangles": triangle_count(lod_obj.data),
+                          "max_error": max_error, "mean_error": mean_error,
+                          "relative_error": max_error / diagonal if diagonal else 0.0})
+        chains.append({"mesh": name, "levels": chain})
+    return chains
+
+OPERATIONS = {
+    "apply_scale": apply_scale,
+    "scale": scale,
+    "uv_rescale": uv_rescale,
+    "decimate": decimate,
+    "subdivide": subdivide,
+    "displace": displace,
+    "deatlas": deatlas,
+    "lod": lod,
+}
+
+# Results of these operations are written next to the output, with this suffix
+SIDECARS = {"lod": ".lods.json"}
+
+# Function to note which data blocks exist, so a job can remove only what it added
+def snapshot():
+    return {datablock.as_pointer() for name in DATA_COLLECTIONS for datablock in getattr(bpy.data, name)}
+
+def remove_added(before):
+    added = [datablock for name in DATA_COLLECTIONS for datablock in getattr(bpy.data, name)
+             if datablock.as_pointer() not in before]
+    if added:
+        bpy.data.batch_remove(added)
+
+# Function to load a mesh file; opening a .blend replaces the whole session
+def load(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.fbx':
+        bpy.ops.import_scene.fbx(filepath=path)
+    elif extension == '.blend':
+        bpy.ops.wm.open_mainfile(filepath=path, load_ui=False)
+    else:
+        raise ValueError(f"cannot load {path}: unsupported file type")
+
+# Function to save the scene; a copy leaves the session pointing at the file it was loaded from
+def save(path, copy=False):
+    extension = os.path.splitext(path)[1].lower()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if extension == '.fbx':
+        bpy.ops.export_scene.fbx(filepath=path, use_selection=False)
+    elif extension == '.blend':
+        bpy.ops.wm.save_as_mainfile(filepath=path, copy=copy)
+    else:
+        raise ValueError(f"cannot save {path}: unsupported file type")
+
+def empty_session():
+    bpy.ops.wm.read_homefile(use_empty=True, use_factory_startup=True)
+
+# Function to put a job in its long form: input, output and a list of steps,
+# each with an operation, its parameters and where to save the result (if anywhere)
+def normalize_job(job, base_dir):
+    if "operations" in job:
+        steps = [{"operation": step["operation"], "parameters": step.get("parameters", {}),
+                  "save": os.path.join(base_dir, step["save"]) if step.get("save") else None}
+                 for step in job["operations"]]
+    elif "operation" in job:
+        steps = [{"operation": job["operation"], "parameters": job.get("parameters", {}), "save": None}]
+    else:
+        steps = []
+    for step in steps:
+        if step["operation"] not in OPERATIONS:
+            raise ValueError(f"unknown operation '{step['operation']}'")
+    input_path = os.path.join(base_dir, job["input"])
+    output_path = os.path.join(base_dir, job["output"]) if job.get("output") else input_path
+    return input_path, steps, output_path
+
+def load_manifest(manifest_path):
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    jobs = manifest["jobs"] if isinstance(manifest, dict) else manifest
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    return [normalize_job(job, base_dir) for job in jobs]
+
+# Function to build jobs for files given on the command line: every file gets the
+# same operations, and is written in place, in another format or next to itself
+def jobs_from_files(files, operations, parameters, output_format=None, suffix='', output_dir=None):
+    steps = [{"operation": operation, "parameters": parameters, "save": None} for operation in operations]
+    jobs = []
+    for path in files:
+        name, extension = os.path.splitext(path)
+        output_path = name + suffix + (output_format or extension)
+        if output_dir:
+            output_path = os.path.join(output_dir, os.path.basename(output_path))
+        jobs.append((os.path.abspath(path), steps, os.path.abspath(output_path)))
+    return jobs
+
+def write_sidecars(output_path, results):
+    for operation, suffix in SIDECARS.items():
+        if operation in results:
+            with open(os.path.splitext(output_path)[0] + suffix, 'w') as f:
+                json.dump({"file": os.path.basename(output_path), "meshes": results[operation]}, f, indent=4)
+
+# Function to run a job, returning how long each stage took and what the
+# operations returned. The scene is emptied afterwards by removing the data
+# blocks the job added, not by resetting Blender; only a job that opened a
+# .blend needs a fresh session for the next one.
+def run_job(input_path, steps, output_path, before):
+    timings = []
+    results = {}
+    replaced_session = input_path.lower().endswith('.blend')
+    try:
+        start = time.perf_counter()
+        load(input_path)
+        timings.append({"stage": "load", "seconds": time.perf_counter() - start})
+        for step in steps:
+            start = time.perf_counter()
+            result = OPERATIONS[step["operation"]](step["parameters"])
+            if result is not None:
+                results[step["operation"]] = result
+            if step["save"]:
+                save(step["save"], copy=True)
+            timings.append({"stage": step["operation"], "seconds": time.perf_counter() - start})
+        start = time.perf_counter()
+        save(output_path)
+        write_sidecars(output_path, results)
+        timings.append({"stage": "save", "seconds": time.perf_counter() - start})
+    finally:
+        if replaced_session:
+            empty_session()
+            before.clear()
+            before.update(snapshot())
+        else:
+            remove_added(before)
+    return timings, results
+
+def parse_parameter(text):
+    key, sep, value = text.partition('=')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"invalid parameter '{text}', expected e.g. ratio=0.3")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="blender -b -P blender-batch.py --", description="Process many meshes in one Blender session.")
+    parser.add_argument("files", nargs="*", help="mesh files to run --operation on, instead of a manifest")
+    parser.add_argument("-m", "--manifest", help="JSON manifest of jobs")
+    parser.add_argument("-o", "--operation", dest="operations", action="append", default=[], choices=sorted(OPERATIONS), help="operation to run on the files; may be repeated to chain them")
+    parser.add_argument("-p", "--param", dest="parameters", action="append", default=[], type=parse_parameter, metavar="KEY=VALUE", help="parameter for the operations, e.g. ratio=0.3")
+    parser.add_argument("--format", dest="output_format", choices=(".fbx", ".blend"), help="save the files in this format instead of their own")
+    parser.add_argument("--suffix", default='', help="add this to the output file names, e.g. _decimated")
+    parser.add_argument("--output-dir", help="write the outputs to this directory")
+    parser.add_argument("--report", metavar="FILE", help="write the timings of every job as JSON to FILE")
+    args = parser.parse_args(argv)
+
+    if args.manifest:
+        jobs = load_manifest(args.manifest)
+    else:
+        jobs = jobs_from_files(args.files, args.operations, dict(args.parameters), args.output_format, args.suffix, args.output_dir)
+
+    empty_session()
+    before = snapshot()
+    report = []
+    errors = 0
+    for input_path, steps, output_path in jobs:
+        print(f"Processing {input_path}...")
+        entry = {"input": input_path, "output": output_path, "operations": [step["operation"] for step in steps]}
+        try:
+            entry["timings"], results = run_job(input_path, steps, output_path, before)
+            if results:
+                entry["results"] = results
+            print(f"Saved {output_path}")
+        except Exception as e:
+            print(f"Error processing file {input_path}: {e}")
+            entry["error"] = str(e)
+            errors += 1
+        report.append(entry)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=4)
+
+    print(f"{len(jobs) - errors} of {len(jobs)} file(s) processed")
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
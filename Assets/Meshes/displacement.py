@@ -0,0 +1,34 @@
+import bpy
+
+# Shared by rough-rocks.py and blender-batch.py: the seeded clouds displacement
+# that roughens the rocks. The scripts run from their own folders, so they add
+# Assets/Meshes to sys.path first.
+
+# Function to set a Displace modifier up with clouds noise. The noise settings are
+# set explicitly, and the noise is sampled around an empty placed by rng, so the
+# same seed always gives the same rock and different seeds give different ones.
+# Returns the texture and the empty; remove them with remove_displacement_helpers
+# once the modifier is applied, and not while looping over the scene's objects.
+def setup_displacement(modifier, rng, strength=0.05, noise_scale=0.25, noise_depth=2):
+    texture = bpy.data.textures.new(name="DisplaceTex", type='CLOUDS')
+    texture.noise_basis = 'BLENDER_ORIGINAL'
+    texture.noise_type = 'SOFT_NOISE'
+    texture.noise_scale = noise_scale
+    texture.noise_depth = noise_depth
+
+    origin = bpy.data.objects.new("DisplaceOrigin", None)
+    origin.location = [rng.uniform(-1000.0, 1000.0) for _ in range(3)]
+    # An empty only gets a world matrix once it is in the scene
+    bpy.context.scene.collection.objects.link(origin)
+    bpy.context.view_layer.update()
+
+    modifier.texture = texture
+    modifier.strength = strength
+    modifier.texture_coords = 'OBJECT'
+    modifier.texture_coords_object = origin
+    return texture, origin
+
+def remove_displacement_helpers(helpers):
+    for texture, origin in helpers:
+        bpy.data.objects.remove(origin)
+        bpy.data.textures.remove(texture)
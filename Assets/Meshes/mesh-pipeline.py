@@ -0,0 +1,347 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Fans mesh jobs out over several Blender processes, each running blender-batch.py
+# over its share of the files. Every file goes through all stages in one worker,
+# e.g. to convert, scale, rescale the UVs and decimate a folder of rocks:
+#   python mesh-pipeline.py Rocks/Round_Rocks --format .blend -s scale:factor=100 -s uv_rescale:scale=0.5 -s decimate:ratio=0.3
+#
+# A folder can instead describe its pipeline in a JSON file, run with --pipeline,
+# as the rock folders do (python mesh-pipeline.py -P Rocks/Round_Rocks/pipeline.json):
+#   {
+#       "inputs": ["*.fbx"],
+#       "stages": [
+#           {"name": "hipoly", "operation": "subdivide", "parameters": {"levels": 1}},
+#           {"name": "rough", "operation": "displace", "parameters": {"strength": 0.05}}
+#       ],
+#       "output": {"dir": "rough", "format": ".fbx", "suffix": ""}
+#   }
+# The result of every stage is cached in the folder's .mesh-cache, keyed by the
+# input's content, the stage and its parameters, and those of the stages before
+# it. A rerun only does the stages whose inputs or parameters changed. Cached
+# results that no pipeline of the folder uses any more are deleted after a run.
+BATCH_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "blender-batch.py")
+MESH_EXTENSIONS = ('.fbx', '.blend')
+CACHE_DIR = ".mesh-cache"
+CACHE_INDEX = "index.json"
+
+# Function to parse a stage such as "decimate:ratio=0.3,keep=1" into a manifest step
+def parse_stage(text):
+    operation, sep, arguments = text.partition(':')
+    parameters = {}
+    for argument in filter(None, arguments.split(',')):
+        key, sep, value = argument.partition('=')
+        if not sep:
+            raise argparse.ArgumentTypeError(f"invalid stage '{text}', expected e.g. decimate:ratio=0.3")
+        try:
+            parameters[key] = json.loads(value)
+        except ValueError:
+            parameters[key] = value
+    return {"operation": operation, "parameters": parameters}
+
+def find_mesh_files(paths, extensions):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                for file in sorted(files):
+                    if file.lower().endswith(extensions):
+                        yield os.path.join(root, file)
+        else:
+            yield path
+
+# Function to build one job per file, with the output named as blender-batch.py would
+def build_jobs(files, stages, output_format=None, suffix='', output_dir=None):
+    jobs = []
+    for path in files:
+        name, extension = os.path.splitext(path)
+        output_path = name + suffix + (output_format or extension)
+        if output_dir:
+            output_path = os.path.join(output_dir, os.path.basename(output_path))
+        jobs.append({"input": os.path.abspath(path), "operations": stages, "output": os.path.abspath(output_path)})
+    return jobs
+
+# Function to load the jobs of an existing manifest, with paths made absolute
+def load_manifest_jobs(manifest_path):
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    jobs = []
+    for job in manifest["jobs"] if isinstance(manifest, dict) else manifest:
+        job = dict(job)
+        job["input"] = os.path.join(base_dir, job["input"])
+        if job.get("output"):
+            job["output"] = os.path.join(base_dir, job["output"])
+        jobs.append(job)
+    return jobs
+
+def file_hash(filepath):
+    hasher = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+# Function to load a pipeline definition; paths in it are relative to its folder
+def load_pipeline(pipeline_path):
+    with open(pipeline_path, 'r') as f:
+        pipeline = json.load(f)
+    folder = os.path.dirname(os.path.abspath(pipeline_path))
+    patterns = pipeline.get("inputs", ["*.fbx"])
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    files = sorted({path for pattern in patterns for path in glob.glob(os.path.join(folder, pattern))})
+    stages = [{"name": stage.get("name", stage["operation"]), "operation": stage["operation"], "parameters": stage.get("parameters", {})}
+              for stage in pipeline.get("stages", [])]
+    return folder, files, stages, pipeline.get("output", {})
+
+def load_cache_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, CACHE_INDEX), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"inputs": {}, "outputs": {}, "pipelines": {}}
+
+def save_cache_index(cache_dir, index):
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(os.path.join(cache_dir, CACHE_INDEX), 'w') as f:
+        json.dump(index, f, indent=4)
+
+# Function to hash an input, reusing the recorded hash while its size and mtime are unchanged
+def input_hash(path, recorded):
+    stat = os.stat(path)
+    if recorded and recorded["size"] == stat.st_size and recorded["mtime"] == stat.st_mtime_ns:
+        return recorded
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha256": file_hash(path)}
+
+# Function to compute the cache key of every stage's result for one input.
+# Each key covers the stage and everything that went into the stage before it.
+def stage_keys(content_hash, stages):
+    keys = []
+    key = content_hash
+    for stage in stages:
+        key = hashlib.sha256(json.dumps([key, stage["name"], stage["operation"], stage["parameters"]], sort_keys=True).encode('utf-8')).hexdigest()
+        keys.append(key)
+    return keys
+
+def output_unchanged(path, recorded):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return recorded["size"] == stat.st_size and recorded["mtime"] == stat.st_mtime_ns
+
+# Function to plan the jobs of a pipeline. Each input starts from the result of
+# its last cached stage and saves the result of every stage it runs to the cache;
+# inputs whose output is already up to date get no job at all.
+# Returns the jobs, the number of inputs skipped and what to record once they ran.
+def plan_pipeline(pipeline_path, force=False):
+    folder, files, stages, output = load_pipeline(pipeline_path)
+    cache_dir = os.path.join(folder, CACHE_DIR)
+    index = load_cache_index(cache_dir)
+    jobs = []
+    pending = {}
+    inputs = {}
+    # Everything this pipeline uses, so the rest of the cache can be pruned
+    used = {"keys": [], "inputs": [], "outputs": []}
+    skipped = 0
+    for path in files:
+        name, extension = os.path.splitext(os.path.basename(path))
+        output_path = os.path.join(folder, output.get("dir", "."), name + output.get("suffix", "") + output.get("format", extension))
+        output_path = os.path.normpath(output_path)
+        if output_path == path:
+            raise ValueError(f"{pipeline_path}: the output of {path} would overwrite it; set an output dir, format or suffix")
+        relative_input = os.path.relpath(path, folder)
+        relative_output = os.path.relpath(output_path, folder)
+
+        inputs[relative_input] = input_hash(path, index["inputs"].get(relative_input))
+        keys = stage_keys(inputs[relative_input]["sha256"], stages)
+        final_key = keys[-1] if keys else inputs[relative_input]["sha256"]
+        used["keys"].extend(keys)
+        used["inputs"].append(relative_input)
+        used["outputs"].append(relative_output)
+        recorded = index["outputs"].get(relative_output)
+        if not force and recorded and recorded["key"] == final_key and output_unchanged(output_path, recorded):
+            skipped += 1
+            continue
+
+        cached = [os.path.join(cache_dir, key + ".blend") for key in keys]
+        done = 0 if force else next((i + 1 for i in reversed(range(len(keys))) if os.path.exists(cached[i])), 0)
+        operations = [{"operation": stages[i]["operation"], "parameters": stages[i]["parameters"], "save": cached[i]}
+                      for i in range(done, len(stages))]
+        jobs.append({"input": cached[done - 1] if done else path, "operations": operations, "output": output_path})
+        pending[output_path] = (relative_output, final_key)
+    return jobs, skipped, (folder, os.path.basename(pipeline_path), inputs, pending, used)
+
+# Function to drop what no pipeline of the folder uses any more: the index records
+# of old inputs and outputs, and cached stage results whose key is not current.
+# Pipelines whose file was deleted no longer count. Returns the files deleted.
+def prune_cache(folder, index):
+    cache_dir = os.path.join(folder, CACHE_DIR)
+    pipelines = {name: used for name, used in index.get("pipelines", {}).items() if os.path.exists(os.path.join(folder, name))}
+    keys = {key for used in pipelines.values() for key in used["keys"]}
+    inputs = {path for used in pipelines.values() for path in used["inputs"]}
+    outputs = {path for used in pipelines.values() for path in used["outputs"]}
+    index["pipelines"] = pipelines
+    index["inputs"] = {path: entry for path, entry in index["inputs"].items() if path in inputs}
+    index["outputs"] = {path: entry for path, entry in index["outputs"].items() if path in outputs}
+
+    removed = 0
+    for entry in os.scandir(cache_dir) if os.path.isdir(cache_dir) else []:
+        # Blender may also leave .blend1 backups of a result next to it
+        if entry.name != CACHE_INDEX and entry.name.split('.')[0] not in keys:
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+# Function to record the outputs the workers produced, so the next run can skip
+# them, and prune the cache. The index is read again, so several pipelines of
+# one folder in the same run each add their records.
+def record_pipeline(state, reports):
+    folder, name, inputs, pending, used = state
+    cache_dir = os.path.join(folder, CACHE_DIR)
+    index = load_cache_index(cache_dir)
+    index["inputs"].update(inputs)
+    for entry in reports:
+        if "error" not in entry and entry["output"] in pending:
+            relative_output, key = pending[entry["output"]]
+            stat = os.stat(entry["output"])
+            index["outputs"][relative_output] = {"key": key, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+    index.setdefault("pipelines", {})[name] = used
+    removed = prune_cache(folder, index)
+    if removed:
+        print(f"{os.path.join(folder, name)}: removed {removed} unused cached result(s)")
+    save_cache_index(cache_dir, index)
+
+# Function to share the jobs between the workers. Larger files take longer, so the
+# largest jobs are handed out first, each to the worker with the least work so far.
+def split_jobs(jobs, workers):
+    sizes = [os.path.getsize(job["input"]) if os.path.exists(job["input"]) else 0 for job in jobs]
+    shares = [[] for _ in range(min(workers, len(jobs)))]
+    loads = [0] * len(shares)
+    for size, job in sorted(zip(sizes, jobs), key=lambda pair: pair[0], reverse=True):
+        worker = loads.index(min(loads))
+        shares[worker].append(job)
+        loads[worker] += size
+    return shares
+
+# Function to run every share in its own Blender process at the same time.
+# Returns the reports of all jobs and the log files of the workers that failed.
+def run_workers(shares, blender, work_dir):
+    processes = []
+    for index, share in enumerate(shares):
+        manifest_path = os.path.join(work_dir, f"manifest-{index}.json")
+        report_path = os.path.join(work_dir, f"report-{index}.json")
+        log_path = os.path.join(work_dir, f"worker-{index}.log")
+        with open(manifest_path, 'w') as f:
+            json.dump(share, f, indent=4)
+        with open(log_path, 'w') as log:
+            command = [blender, "-b", "--factory-startup", "-P", BATCH_SCRIPT, "--", "--manifest", manifest_path, "--report", report_path]
+            processes.append((subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT), report_path, log_path))
+
+    reports = []
+    failed_logs = []
+    for process, report_path, log_path in processes:
+        if process.wait() != 0:
+            failed_logs.append(log_path)
+        try:
+            with open(report_path, 'r') as f:
+                reports.extend(json.load(f))
+        except (OSError, ValueError):
+            pass
+    return reports, failed_logs
+
+# Function to add up the time spent in each stage over all jobs
+def stage_timings(reports):
+    stages = {}
+    for entry in reports:
+        for timing in entry.get("timings", []):
+            total, count, longest = stages.get(timing["stage"], (0.0, 0, 0.0))
+            stages[timing["stage"]] = (total + timing["seconds"], count + 1, max(longest, timing["seconds"]))
+    return stages
+
+def print_timings(stages, wall_time, workers):
+    print(f"{'Stage':<16}{'Runs':>6}{'Total s':>10}{'Mean s':>10}{'Max s':>10}")
+    for stage, (total, count, longest) in stages.items():
+        print(f"{stage:<16}{count:>6}{total:>10.2f}{total / count:>10.2f}{longest:>10.2f}")
+    busy = sum(total for total, count, longest in stages.values())
+    print(f"Wall time {wall_time:.2f}s over {workers} worker(s), {busy:.2f}s of work")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run mesh operations over many files in parallel Blender workers.")
+    parser.add_argument("paths", nargs="*", help="mesh files, or directories searched recursively for them")
+    parser.add_argument("-m", "--manifest", help="run the jobs of a blender-batch.py manifest instead")
+    parser.add_argument("-P", "--pipeline", dest="pipelines", action="append", default=[], help="run the pipeline defined in this JSON file instead; may be repeated")
+    parser.add_argument("--force", action="store_true", help="with --pipeline, ignore cached results and rerun every stage")
+    parser.add_argument("-s", "--stage", dest="stages", action="append", default=[], type=parse_stage, metavar="OPERATION[:KEY=VALUE,...]", help="operation to run on every file; repeat to chain stages in order")
+    parser.add_argument("-e", "--ext", dest="extensions", action="append", help="only take files with this extension from directories (default: .fbx and .blend)")
+    parser.add_argument("--format", dest="output_format", choices=(".fbx", ".blend"), help="save the files in this format instead of their own")
+    parser.add_argument("--suffix", default='', help="add this to the output file names, e.g. _decimated")
+    parser.add_argument("--output-dir", help="write the outputs to this directory")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="number of Blender processes (default: all cores)")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable (default: $BLENDER or blender)")
+    parser.add_argument("--report", metavar="FILE", help="write the timings of every job as JSON to FILE")
+    args = parser.parse_args()
+
+    pipeline_states = []
+    if args.pipelines:
+        jobs = []
+        for pipeline_path in args.pipelines:
+            try:
+                pipeline_jobs, skipped, state = plan_pipeline(pipeline_path, args.force)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error processing pipeline {pipeline_path}: {e}")
+                sys.exit(1)
+            print(f"{pipeline_path}: {len(pipeline_jobs)} file(s) to process, {skipped} up to date")
+            jobs.extend(pipeline_jobs)
+            pipeline_states.append(state)
+    elif args.manifest:
+        jobs = load_manifest_jobs(args.manifest)
+    else:
+        extensions = tuple(ext.lower() for ext in args.extensions) if args.extensions else MESH_EXTENSIONS
+        files = list(find_mesh_files(args.paths, extensions))
+        jobs = build_jobs(files, args.stages, args.output_format, args.suffix, args.output_dir)
+    if not jobs:
+        for state in pipeline_states:
+            record_pipeline(state, [])
+        print("No files to process")
+        return
+
+    shares = split_jobs(jobs, max(1, args.jobs))
+    print(f"Processing {len(jobs)} file(s) in {len(shares)} Blender worker(s)...")
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="mesh-pipeline-") as work_dir:
+        try:
+            reports, failed_logs = run_workers(shares, args.blender, work_dir)
+        except OSError as e:
+            print(f"Could not start Blender ({args.blender}): {e}")
+            sys.exit(1)
+        for log_path in failed_logs:
+            with open(log_path, 'r', errors='replace') as log:
+                print(f"Worker {os.path.basename(log_path)} failed:\n{log.read()[-2000:]}")
+    wall_time = time.perf_counter() - start
+    for state in pipeline_states:
+        record_pipeline(state, reports)
+
+    for entry in reports:
+        if "error" in entry:
+            print(f"Error processing file {entry['input']}: {entry['error']}")
+    print_timings(stage_timings(reports), wall_time, len(shares))
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(reports, f, indent=4)
+
+    processed = sum(1 for entry in reports if "error" not in entry)
+    print(f"{processed} of {len(jobs)} file(s) processed")
+    if failed_logs or processed != len(jobs):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import math
+
+import numpy as np
+
+# Shared by the Blender UV scripts: a UV layer is read into one array, transformed
+# in bulk and written back, instead of touching each loop's UV through bpy.
+# The scripts run from their own folders, so they add Assets/Meshes to sys.path first.
+
+# Function to read all UVs of a layer as an (n, 2) array
+def read_uvs(uv_layer):
+    uvs = np.empty(len(uv_layer.data) * 2, dtype=np.float32)
+    uv_layer.data.foreach_get("uv", uvs)
+    return uvs.reshape(-1, 2)
+
+def write_uvs(uv_layer, uvs):
+    uv_layer.data.foreach_set("uv", np.ascontiguousarray(uvs, dtype=np.float32).ravel())
+
+# Function to scale, then rotate (in degrees, counter-clockwise) about pivot, then offset UVs
+def transform_uvs(uvs, scale=1.0, offset=(0.0, 0.0), rotation=0.0, pivot=(0.0, 0.0)):
+    scale = np.broadcast_to(np.asarray(scale, dtype=np.float64), (2,))
+    result = (uvs - pivot) * scale
+    if rotation:
+        angle = math.radians(rotation)
+        cos, sin = math.cos(angle), math.sin(angle)
+        result = result @ np.array([[cos, sin], [-sin, cos]])
+    return result + pivot + offset
+
+# Function to transform every UV layer of a mesh object. UVs edited in edit mode
+# are not in the mesh data yet, so the object must be in object mode.
+def transform_object_uvs(obj, scale=1.0, offset=(0.0, 0.0), rotation=0.0, pivot=(0.0, 0.0)):
+    for uv_layer in obj.data.uv_layers:
+        write_uvs(uv_layer, transform_uvs(read_uvs(uv_layer), scale, offset, rotation, pivot))
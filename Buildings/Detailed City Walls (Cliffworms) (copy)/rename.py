@@ -1,29 +1,106 @@
-import os
+import argparse
 import json
+import os
+import sys
+
+# Function to get the name a template should have: the ModelId of its first exterior model
+def base_name_for(filename):
+    with open(filename, 'r') as file:
+        data = json.load(file)
+    return data['RmbSubRecord']['Exterior']['Block3dObjectRecords'][0]['ModelId']
 
-# Function to generate a new filename with an incrementing number if needed
-def generate_new_filename(base_filename, extension='.json'):
-    counter = 1
-    new_filename = f"{base_filename}{extension}"
-    while os.path.exists(new_filename):
-        new_filename = f"{base_filename}-{str(counter).zfill(2)}{extension}"
-        counter += 1
-    return new_filename
-
-# Loop through each file in the current directory
-for filename in os.listdir('.'):
-    if filename.endswith('.json'):
-        with open(filename, 'r') as file:
-            data = json.load(file)
-        
+# Function to check whether a filename is already a valid name for base: base.json or base-NN.json
+def has_name_for(filename, base, extension='.json'):
+    if not filename.endswith(extension):
+        return False
+    stem = filename[:-len(extension)]
+    if stem == base:
+        return True
+    prefix, separator, suffix = stem.rpartition('-')
+    return prefix == base and len(suffix) >= 2 and suffix.isdigit()
+
+# Function to plan every rename from a single directory listing.
+# Templates that already carry a valid name for their ModelId keep it, so running
+# the script again renames nothing. The others get the base name or the next free
+# -01, -02, ... suffix; the suffix counter per base name is kept, so each
+# allocation is O(1). Returns a list of (old name, new name) pairs.
+def plan_renames(filenames, extension='.json'):
+    targets = {}
+    for filename in sorted(filenames):
+        if not filename.endswith(extension):
+            continue
         try:
-            model_id = data['RmbSubRecord']['Exterior']['Block3dObjectRecords'][0]['ModelId']
-            base_new_filename = model_id
-            new_filename = generate_new_filename(base_new_filename)
-            
-            # Renaming the file
-            os.rename(filename, new_filename)
-            print(f'Renamed {filename} to {new_filename}')
-        except (KeyError, IndexError) as e:
+            targets[filename] = base_name_for(filename)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
             print(f'Error processing {filename}: {e}')
 
+    # Names that stay taken: everything in the folder that is not a template, and
+    # the templates that already have a valid name
+    occupied = {filename for filename in filenames if filename not in targets}
+    occupied.update(filename for filename, base in targets.items() if has_name_for(filename, base, extension))
+    counters = {}
+    plan = []
+    for filename, base in targets.items():
+        if filename in occupied:
+            continue
+        counter = counters.get(base, 0)
+        new_filename = f"{base}{extension}" if counter == 0 else f"{base}-{str(counter).zfill(2)}{extension}"
+        while new_filename in occupied:
+            counter += 1
+            new_filename = f"{base}-{str(counter).zfill(2)}{extension}"
+        counters[base] = counter + 1
+        occupied.add(new_filename)
+        plan.append((filename, new_filename))
+    return plan
+
+# Function to list the moves for a rename plan, carrying Unity .meta files along
+def expand_with_meta(plan, filenames):
+    moves = []
+    for old, new in plan:
+        moves.append((old, new))
+        if old + '.meta' in filenames:
+            moves.append((old + '.meta', new + '.meta'))
+    return moves
+
+# Function to apply all moves or none. Every file is first moved to a temporary
+# name, so chains and swaps (a -> b while b -> c) cannot collide; if any step
+# fails, the steps already done are undone in reverse order.
+def apply_moves(moves):
+    done = []
+    staged = [(old, f".renaming-{index}-{old}", new) for index, (old, new) in enumerate(moves)]
+    try:
+        for old, temp, new in staged:
+            os.rename(old, temp)
+            done.append((old, temp))
+        for old, temp, new in staged:
+            if os.path.exists(new):
+                raise FileExistsError(f"{new} already exists")
+            os.rename(temp, new)
+            done.append((temp, new))
+    except OSError:
+        for source, destination in reversed(done):
+            os.rename(destination, source)
+        raise
+
+def main():
+    parser = argparse.ArgumentParser(description="Rename the templates in the current directory after the ModelId of their first exterior model.")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="print the renames without doing them")
+    args = parser.parse_args()
+
+    filenames = set(os.listdir('.'))
+    plan = plan_renames(filenames)
+    if args.dry_run:
+        for old, new in plan:
+            print(f'Would rename {old} to {new}')
+        return
+
+    try:
+        apply_moves(expand_with_meta(plan, filenames))
+    except OSError as e:
+        print(f'Renaming failed, all files were left as they were: {e}')
+        sys.exit(1)
+    for old, new in plan:
+        print(f'Renamed {old} to {new}')
+
+if __name__ == "__main__":
+    main()
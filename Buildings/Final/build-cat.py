@@ -1,11 +1,32 @@
+import argparse
+import hashlib
+import itertools
 import json
 import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-# Initialize data structures
-output_data = {
-    "list": [],
-    "templates": {}
-}
+# Default catalog written by this script
+DEFAULT_OUTPUT_FILE = "rmbrp-buildings-catalog.json"
+
+# First ID handed out to a building template
+FIRST_ID = 3000
+
+# Build manifests are stored next to the catalog as ".<catalog>.manifest.json";
+# the leading dot keeps Unity from importing them
+MANIFEST_SUFFIX = ".manifest.json"
+MANIFEST_VERSION = 1
+
+# Templates sit two levels deep in the catalog: {"templates": {"3000": {...}}}
+TEMPLATE_DEPTH = 2
+INDENT = 4
+
+# Output profiles: "pretty" matches json.dump(indent=4) and is easy to diff,
+# "compact" drops all whitespace for the catalog that ships with the release
+PROFILES = ("pretty", "compact")
 
 # Function to extract details from filename
 def extract_details_from_filename(filename):
@@ -13,70 +34,421 @@ def extract_details_from_filename(filename):
     parts = os.path.splitext(os.path.basename(filename))[0].split('-')
     return parts if len(parts) == 3 else None
 
-# Function to process the JSON files
-def process_json_file(json_file, id_counter, subcategory_counts):
-    details = extract_details_from_filename(json_file)
-    if not details:
-        return id_counter  # Skip files with incorrect naming format
+# Function to hash the content of a file without reading it all at once
+def file_hash(filepath, chunk_size=1 << 16):
+    hasher = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
 
-    category, subcategory, label = details
+# Function to serialize a value the way json.dump would at the given depth of the catalog
+def serialize(value, depth, profile):
+    if profile == "compact":
+        return json.dumps(value, separators=(',', ':'))
+    text = json.dumps(value, indent=INDENT)
+    return text.replace("\n", "\n" + " " * (INDENT * depth))
 
-    # Update the subcategory count
-    subcategory_key = (category, subcategory)
-    subcategory_counts[subcategory_key] = subcategory_counts.get(subcategory_key, 0) + 1
+# Function to get the line break and indentation that precede an item at the given depth
+def newline(depth, profile):
+    return "" if profile == "compact" else "\n" + " " * (INDENT * depth)
 
-    id_label = f"{id_counter:04}"
+def key_separator(profile):
+    return ":" if profile == "compact" else ": "
 
-    # Append the data to the output list
-    output_data["list"].append({
-        "ID": id_label,
-        "Label": label,
-        "Category": category,
-        "Subcategory": subcategory,
-        "Filename": json_file  # Temporarily store filename for later processing
-    })
+# Function to hash what a template means rather than how it is written,
+# so templates that differ only in key order or whitespace match
+def content_hash(data):
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+# Function to read and check a building template; runs in the worker processes.
+# The template comes back already serialized so the parent only has to copy bytes,
+# together with the file's sha256 and, on request, its size in every profile
+# ("sizes") and its content hash ("content").
+def load_template(json_file, profile, measure=False, fingerprint=False):
+    with open(json_file, "rb") as f:
+        content = f.read()
+    result = {"sha256": hashlib.sha256(content).hexdigest(), "error": None}
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        return dict(result, error=f"{json_file}: {e}")
+    if not isinstance(data, dict) or not isinstance(data.get("RmbSubRecord"), dict):
+        return dict(result, error=f"{json_file}: not an RMB building template")
+    result["text"] = serialize(data, TEMPLATE_DEPTH, profile).encode("utf-8")
+    if measure:
+        result["sizes"] = {other: len(serialize(data, TEMPLATE_DEPTH, other).encode("utf-8")) for other in PROFILES}
+    if fingerprint:
+        result["content"] = content_hash(data)
+    return result
 
-    # Read and add template data
-    with open(json_file, "r") as f:
-        data = json.load(f)
-        output_data["templates"][id_label] = data
+# Function to load many templates, spread over worker processes when jobs > 1.
+# Results are yielded in the same order as json_files, with only a few
+# templates per worker held in memory at any time.
+def load_templates(json_files, jobs, profile, measure=False, fingerprint=False):
+    load = partial(load_template, profile=profile, measure=measure, fingerprint=fingerprint)
+    if jobs <= 1 or len(json_files) < 2:
+        for json_file in json_files:
+            yield load(json_file)
+        return
 
-    return id_counter + 1
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        remaining = iter(json_files)
+        pending = deque(executor.submit(load, json_file) for json_file in itertools.islice(remaining, jobs * 4))
+        while pending:
+            result = pending.popleft().result()
+            for json_file in itertools.islice(remaining, 1):
+                pending.append(executor.submit(load, json_file))
+            yield result
 
-def find_json_files_recursively(start_path):
+# Function to recursively find JSON files
+def find_json_files_recursively(start_path, exclude=()):
     json_files = []
     for root, dirs, files in os.walk(start_path):
         for file in files:
-            if file.endswith(".json") and file != "rmbrp-buildings-catalog.json":
+            if file.endswith(".json") and not file.endswith(MANIFEST_SUFFIX) and file not in exclude:
                 json_files.append(os.path.join(root, file))
     return json_files
 
+# Function to get the manifest path that belongs to a catalog
+def manifest_path_for(output_file):
+    folder, name = os.path.split(os.path.splitext(output_file)[0])
+    return os.path.join(folder, "." + name + MANIFEST_SUFFIX)
+
+# Function to identify the exact catalog file a manifest was written for
+def output_stamp(output_file):
+    try:
+        stat = os.stat(output_file)
+    except OSError:
+        return None
+    return {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+# Function to load a build manifest, returning an empty one if it is missing or stale
+def load_manifest(manifest_file):
+    empty = {"output": None, "profile": None, "dedupe": False, "files": {}}
+    try:
+        with open(manifest_file, "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return empty
+    if manifest.get("version") != MANIFEST_VERSION:
+        return empty
+    return dict(empty, **manifest)
+
+def save_manifest(manifest_file, entries, stamp, profile, dedupe):
+    manifest = {"version": MANIFEST_VERSION, "output": stamp, "profile": profile, "dedupe": dedupe, "files": entries}
+    with open(manifest_file, "w") as f:
+        json.dump(manifest, f, indent=4)
+
+# Function to describe a template file in the build manifest.
+# Files that failed to load are remembered with an ID of None.
+def make_manifest_entry(details, id_label, stat, result):
+    category, subcategory, label = details
+    entry = {
+        "ID": id_label,
+        "Category": category,
+        "Subcategory": subcategory,
+        "Label": label,
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": result["sha256"],
+    }
+    for key in ("sizes", "content"):
+        if key in result:
+            entry[key] = result[key]
+    return entry
+
+# Function to build the catalog list from the manifest entries
+def build_list(entries):
+    # Count the templates in each subcategory
+    entries = [entry for entry in entries.values() if entry["ID"] is not None]
+    subcategory_counts = {}
+    for entry in entries:
+        subcategory_key = (entry["Category"], entry["Subcategory"])
+        subcategory_counts[subcategory_key] = subcategory_counts.get(subcategory_key, 0) + 1
+
+    # Add the bracketed count to each Subcategory
+    items = []
+    for entry in entries:
+        count = subcategory_counts[(entry["Category"], entry["Subcategory"])]
+        items.append({
+            "ID": entry.get("Template", entry["ID"]),
+            "Label": entry["Label"],
+            "Category": entry["Category"],
+            "Subcategory": f"{entry['Subcategory']} [{count}]"
+        })
+
+    # Sort the list alphabetically by Category, then by Subcategory, and finally by Label
+    items.sort(key=lambda x: (x['Category'], x['Subcategory'], x['Label']))
+    return items
+
+# Writes the "templates" section one template at a time to a scratch file and
+# records where each serialized template starts, so the catalog can be
+# assembled with the list first and unchanged templates can later be copied verbatim.
+# With dedupe, a template whose content was already written is not written again;
+# its manifest entry gets a "Template" field naming the ID that holds the body.
+class TemplateWriter:
+    def __init__(self, f, profile, dedupe=False):
+        self.f = f
+        self.profile = profile
+        self.dedupe = dedupe
+        self.count = 0
+        self.bodies = {}
+        self.duplicates = 0
+        self.bytes_saved = 0
+
+    # text is the serialized template, or a function returning it when it may not be needed
+    def place(self, entry, text):
+        entry.pop("Template", None)
+        canonical = self.bodies.get(entry.get("content")) if self.dedupe else None
+        if canonical is not None:
+            entry["Template"] = canonical["ID"]
+            entry.pop("offset", None)
+            entry.pop("length", None)
+            self.duplicates += 1
+            self.bytes_saved += canonical["length"]
+            return
+
+        if callable(text):
+            text = text()
+        entry["offset"] = self.write(entry["ID"], text)
+        entry["length"] = len(text)
+        if self.dedupe:
+            self.bodies[entry["content"]] = entry
+
+    def write(self, id_label, text):
+        separator = "," if self.count else ""
+        key = newline(TEMPLATE_DEPTH, self.profile) + json.dumps(id_label) + key_separator(self.profile)
+        self.f.write((separator + key).encode("utf-8"))
+        offset = self.f.tell()
+        self.f.write(text)
+        self.count += 1
+        return offset
+
+# Function to write the catalog: the list section followed by the streamed templates
+def write_catalog(output_file, items, writer, entries):
+    profile = writer.profile
+    head = ("{" + newline(1, profile) + '"list"' + key_separator(profile) + serialize(items, 1, profile) + ","
+            + newline(1, profile) + '"templates"' + key_separator(profile) + "{").encode("utf-8")
+    tail = ((newline(1, profile) if writer.count else "") + "}" + newline(0, profile) + "}").encode("utf-8")
+    start = len(head)
+
+    # Write to a temporary file and swap it in, so an interrupted build never leaves a truncated catalog
+    temp_file = output_file + ".tmp"
+    with open(temp_file, "wb") as f:
+        f.write(head)
+        if writer.count:
+            writer.f.seek(0)
+            shutil.copyfileobj(writer.f, f)
+        f.write(tail)
+    os.replace(temp_file, output_file)
+
+    # Make template offsets relative to the start of the catalog
+    for entry in entries.values():
+        if "offset" in entry:
+            entry["offset"] += start
+
+# Function to rebuild every template from scratch, assigning IDs in discovery order
+def full_build(json_files, jobs, writer, measure):
+    # Skip files with incorrect naming format
+    candidates = [json_file for json_file in json_files if extract_details_from_filename(json_file)]
+    loaded = load_templates(candidates, jobs, writer.profile, measure, writer.dedupe)
+
+    entries = {}
+    id_counter = FIRST_ID
+    for json_file, result in zip(candidates, loaded):
+        details = extract_details_from_filename(json_file)
+        if result["error"]:
+            print(f"Skipping {result['error']}")
+            entries[json_file] = make_manifest_entry(details, None, os.stat(json_file), result)
+            continue
+
+        id_label = f"{id_counter:04}"
+        entry = make_manifest_entry(details, id_label, os.stat(json_file), result)
+        writer.place(entry, result["text"])
+        entries[json_file] = entry
+        id_counter += 1
+    return entries
+
+# Function to find the templates whose content changed since the last run.
+# Changed and new files are mapped to None.
+def incremental_scan(json_files, previous_entries):
+    entries = {}
+    for json_file in json_files:
+        details = extract_details_from_filename(json_file)
+        if not details:
+            continue  # Skip files with incorrect naming format
+
+        entries[json_file] = None
+        previous = previous_entries.get(json_file)
+        if previous is None:
+            continue
+
+        stat = os.stat(json_file)
+        if previous["mtime"] == stat.st_mtime_ns and previous["size"] == stat.st_size:
+            entries[json_file] = previous
+            continue
+
+        # The file was touched; only re-parse it if its content really changed
+        digest = file_hash(json_file)
+        if digest == previous["sha256"]:
+            entries[json_file] = dict(previous, mtime=stat.st_mtime_ns, size=stat.st_size)
+
+    removed = [json_file for json_file in previous_entries if json_file not in entries]
+    return entries, removed
+
+# Function to splice the changed templates between the unchanged ones copied from the previous catalog
+def incremental_build(entries, previous_entries, previous_catalog, jobs, writer, measure):
+    # Keep IDs stable: new files are numbered after the highest ID ever assigned
+    used_ids = [int(entry["ID"]) for entry in previous_entries.values() if entry["ID"] is not None]
+    id_counter = max(used_ids) + 1 if used_ids else FIRST_ID
+
+    def reusable(entry):
+        if entry is None or entry["ID"] is None:
+            return entry is not None
+        return (previous_catalog is not None and ("offset" in entry or "Template" in entry)
+                and (not measure or "sizes" in entry) and (not writer.dedupe or "content" in entry))
+
+    # Text of an unchanged template: copied from the previous catalog, or re-read
+    # if the previous catalog only had it as a duplicate of another template
+    def previous_text(json_file, entry):
+        def read():
+            if "offset" not in entry:
+                return load_template(json_file, writer.profile)["text"]
+            previous_catalog.seek(entry["offset"])
+            return previous_catalog.read(entry["length"])
+        return read
+
+    stale = [json_file for json_file, entry in entries.items() if not reusable(entry)]
+    loaded = load_templates(stale, jobs, writer.profile, measure, writer.dedupe)
+
+    new_entries = {}
+    for json_file, entry in entries.items():
+        if reusable(entry):
+            if entry["ID"] is not None:
+                text = previous_text(json_file, entry)
+                entry = dict(entry)
+                writer.place(entry, text)
+            new_entries[json_file] = entry
+            continue
+
+        result = next(loaded)
+        details = extract_details_from_filename(json_file)
+        if result["error"]:
+            print(f"Skipping {result['error']}")
+            new_entries[json_file] = make_manifest_entry(details, None, os.stat(json_file), result)
+            continue
+
+        previous = previous_entries.get(json_file)
+        if previous is not None and previous["ID"] is not None:
+            id_label = previous["ID"]
+        else:
+            id_label = f"{id_counter:04}"
+            id_counter += 1
+        entry = make_manifest_entry(details, id_label, os.stat(json_file), result)
+        writer.place(entry, result["text"])
+        new_entries[json_file] = entry
+    loaded.close()
+    return new_entries, len(stale)
+
+# Function to measure every section of the catalog in each output profile
+def size_report(items, entries):
+    templates = {}
+    for json_file, entry in entries.items():
+        if entry["ID"] is not None and "Template" not in entry:
+            templates[entry["ID"]] = dict(entry["sizes"], file=json_file)
+    return {
+        "list": {profile: len(serialize(items, 1, profile).encode("utf-8")) for profile in PROFILES},
+        "templates": {profile: sum(sizes[profile] for sizes in templates.values()) for profile in PROFILES},
+        "per_template": templates
+    }
+
+# Function to print or save the size report
+def report_sizes(destination, items, entries):
+    report = size_report(items, entries)
+    if destination == "-":
+        print_size_report(report)
+    else:
+        with open(destination, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"Size report written to {destination}")
+
+# Function to print the bytes the compact profile saves per section and per template
+def print_size_report(report):
+    def row(name, sizes):
+        saved = sizes["pretty"] - sizes["compact"]
+        percent = 100 * saved / sizes["pretty"] if sizes["pretty"] else 0
+        return f"{name:<12}{sizes['pretty']:>12}{sizes['compact']:>12}{saved:>12}{percent:>8.1f}%"
+
+    header = f"{'pretty':>12}{'compact':>12}{'saved':>12}"
+    print(f"{'Section':<12}{header}")
+    print(row("list", report["list"]))
+    print(row("templates", report["templates"]))
+    print()
+    print(f"{'Template':<12}{header}{'':>9}  File")
+    per_template = sorted(report["per_template"].items(), key=lambda x: x[1]["compact"] - x[1]["pretty"])
+    for id_label, sizes in per_template:
+        print(row(id_label, sizes) + "  " + sizes["file"])
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a buildings catalog from the RMB templates below the current directory.")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT_FILE, help=f"catalog to write (default: {DEFAULT_OUTPUT_FILE})")
+    parser.add_argument("-i", "--incremental", action="store_true", help="only re-read templates that changed since the last build and keep their IDs")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="number of processes used to load templates (default: all cores)")
+    parser.add_argument("-p", "--profile", choices=PROFILES, default="pretty", help="output layout: pretty for diffs, compact for release (default: pretty)")
+    parser.add_argument("-d", "--dedupe", action="store_true", help="write identical templates once and point all their list entries at that ID")
+    parser.add_argument("--report", nargs="?", const="-", metavar="FILE", help="report the bytes each profile takes per section and per template; printed, or written as JSON to FILE")
+    args = parser.parse_args()
+
+    output_file = args.output
+    manifest_file = manifest_path_for(output_file)
+    measure = args.report is not None
 
-# Process all JSON files found recursively in the current directory
-id_counter = 3000
-subcategory_counts = {}
-json_files = find_json_files_recursively(".")
+    # Process all JSON files found recursively in the current directory
+    json_files = find_json_files_recursively(".", exclude={os.path.basename(output_file)})
 
-for file in json_files:
-    id_counter = process_json_file(file, id_counter, subcategory_counts)
+    with tempfile.TemporaryFile() as scratch:
+        writer = TemplateWriter(scratch, args.profile, args.dedupe)
+        if args.incremental:
+            manifest = load_manifest(manifest_file)
+            previous_entries = manifest["files"]
+            entries, removed = incremental_scan(json_files, previous_entries)
 
-# Add the bracketed count to each Subcategory
-for item in output_data["list"]:
-    cat_subcat_key = (item["Category"], item["Subcategory"])
-    count = subcategory_counts[cat_subcat_key]
-    item["Subcategory"] = f"{item['Subcategory']} [{count}]"
+            # Only copy from the previous catalog if it is the exact file the manifest describes
+            catalog_intact = (manifest["output"] is not None and manifest["output"] == output_stamp(output_file)
+                              and manifest["profile"] == args.profile)
+            same_options = manifest["dedupe"] == args.dedupe
+            up_to_date = None not in entries.values() and not removed and list(entries) == list(previous_entries)
+            if catalog_intact and same_options and up_to_date and not (measure and any(e["ID"] and "sizes" not in e for e in entries.values())):
+                if entries != previous_entries:
+                    save_manifest(manifest_file, entries, manifest["output"], args.profile, args.dedupe)
+                print(f"{output_file} is up to date")
+                if measure:
+                    report_sizes(args.report, build_list(entries), entries)
+                return
 
-# Remove the temporary filename field
-for item in output_data["list"]:
-    del item["Filename"]
+            previous_catalog = open(output_file, "rb") if catalog_intact else None
+            try:
+                entries, reloaded = incremental_build(entries, previous_entries, previous_catalog, args.jobs, writer, measure)
+            finally:
+                if previous_catalog is not None:
+                    previous_catalog.close()
+            print(f"Rebuilt {reloaded} changed template(s), dropped {len(removed)} removed template(s)")
+        else:
+            entries = full_build(json_files, args.jobs, writer, measure)
 
-# Sort the list alphabetically by Category, then by Subcategory, and finally by Label
-output_data["list"].sort(key=lambda x: (x['Category'], x['Subcategory'], x['Label']))
+        # Output the final data to a JSON file
+        items = build_list(entries)
+        write_catalog(output_file, items, writer, entries)
 
-# Output the final data to a JSON file
-output_file = "rmbrp-buildings-catalog.json"
-with open(output_file, "w") as f:
-    json.dump(output_data, f, indent=4)
+    save_manifest(manifest_file, entries, output_stamp(output_file), args.profile, args.dedupe)
 
-print(f"Output written to {output_file}")
+    print(f"Output written to {output_file}")
+    if args.dedupe:
+        print(f"Deduplicated {writer.duplicates} template(s), saving {writer.bytes_saved} bytes")
+    if measure:
+        report_sizes(args.report, items, entries)
 
+if __name__ == "__main__":
+    main()
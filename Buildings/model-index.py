@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import re
+import sys
+
+# The index lives in the indexed directory; the leading dot keeps Unity from importing it
+INDEX_FILE = ".model-index.json"
+INDEX_VERSION = 1
+
+SECTIONS = ("Exterior", "Interior")
+FLAT_LISTS = ("BlockFlatObjectRecords", "BlockPeopleRecords")
+
+def find_json_files(directory):
+    for root, dirs, files in os.walk(directory):
+        for file in files:
+            if file.endswith('.json') and file != INDEX_FILE:
+                yield os.path.join(root, file)
+
+# Function to collect what one template uses:
+#   models: ModelIdNum -> [[section, record index], ...]
+#   flats: "archive.record" -> [[section, list, record index], ...]
+# Returns None for JSON files that are not building templates.
+def scan_template(file_path):
+    with open(file_path, 'r', encoding='utf-8') as file:
+        data = json.load(file)
+    if not isinstance(data, dict) or not isinstance(data.get('RmbSubRecord'), dict):
+        return None
+
+    models = {}
+    flats = {}
+    for section in SECTIONS:
+        records = data['RmbSubRecord'].get(section) or {}
+        for index, record in enumerate(records.get('Block3dObjectRecords') or []):
+            if 'ModelIdNum' in record:
+                models.setdefault(str(record['ModelIdNum']), []).append([section, index])
+        for flat_list in FLAT_LISTS:
+            for index, record in enumerate(records.get(flat_list) or []):
+                if 'TextureArchive' in record and 'TextureRecord' in record:
+                    key = f"{record['TextureArchive']}.{record['TextureRecord']}"
+                    flats.setdefault(key, []).append([section, flat_list, index])
+    return {"BuildingType": data.get('BuildingType'), "models": models, "flats": flats}
+
+def load_index(index_file):
+    try:
+        with open(index_file, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {"files": {}}
+    return index if index.get("version") == INDEX_VERSION else {"files": {}}
+
+# Function to turn the per-file entries into lookups from each model, flat and
+# building type to the templates (and record positions) that use it
+def invert(files):
+    models = {}
+    flats = {}
+    building_types = {}
+    for file_path, entry in files.items():
+        if entry["template"] is None:
+            continue
+        for model, positions in entry["template"]["models"].items():
+            models.setdefault(model, []).extend([file_path] + position for position in positions)
+        for flat, positions in entry["template"]["flats"].items():
+            flats.setdefault(flat, []).extend([file_path] + position for position in positions)
+        building_type = entry["template"]["BuildingType"]
+        building_types.setdefault(str(building_type), []).append(file_path)
+    return {"models": models, "flats": flats, "building_types": building_types}
+
+def save_index(index_file, files, lookups):
+    with open(index_file, 'w') as f:
+        json.dump(dict({"version": INDEX_VERSION, "files": files}, **lookups), f)
+
+# Function to bring the index up to date, re-reading only files whose size or mtime changed.
+# Returns the lookups and the number of files that were (re)scanned.
+def update_index(directory, index_file):
+    index = load_index(index_file)
+    previous = index["files"]
+    files = {}
+    scanned = 0
+    for file_path in find_json_files(directory):
+        stat = os.stat(file_path)
+        entry = previous.get(file_path)
+        if entry is None or entry["mtime"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            try:
+                template = scan_template(file_path)
+            except ValueError as e:
+                print(f"Error processing file {file_path}: {e}")
+                template = None
+            entry = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "template": template}
+            scanned += 1
+        files[file_path] = entry
+
+    # A new index has no lookups yet, even for a directory without templates
+    if scanned or files.keys() != previous.keys() or "models" not in index:
+        index = invert(files)
+        save_index(index_file, files, index)
+    return index, scanned
+
+# Function to find the lookup keys a query matches; 'x' matches any digit, so 28xx finds 2800-2899
+def match_keys(lookup, query):
+    if 'x' not in query:
+        return [query] if query in lookup else []
+    pattern = re.compile(re.escape(query).replace('x', r'\d') + '$')
+    return sorted((key for key in lookup if pattern.match(key)), key=lambda key: [int(part) for part in key.split('.')])
+
+def print_hits(lookup, queries, describe):
+    total = 0
+    for query in queries:
+        for key in match_keys(lookup, query):
+            hits = lookup[key]
+            templates = {}
+            for hit in hits:
+                templates.setdefault(hit[0], []).append(describe(hit))
+            total += len(templates)
+            print(f"{key}: {len(hits)} record(s) in {len(templates)} template(s)")
+            for file_path, positions in sorted(templates.items()):
+                print(f"    {file_path}: {', '.join(positions)}")
+    return total
+
+def print_templates(lookup, queries):
+    total = 0
+    for query in queries:
+        for key in match_keys(lookup, query):
+            total += len(lookup[key])
+            print(f"{key}: {len(lookup[key])} template(s)")
+            for file_path in sorted(lookup[key]):
+                print(f"    {file_path}")
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Index which building templates use which models, flats and building types.")
+    parser.add_argument("-d", "--directory", default=".", help="directory of templates to index (default: .)")
+    parser.add_argument("--index", help=f"index file (default: {INDEX_FILE} in the directory)")
+    parser.add_argument("--no-update", action="store_true", help="query the index as it is, without checking for changed templates")
+    parser.add_argument("--json", action="store_true", help="print query results as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("update", help="build the index, or refresh it for templates that changed")
+    model_parser = commands.add_parser("model", help="templates using a ModelIdNum, e.g. 20412 or 28xx")
+    model_parser.add_argument("ids", nargs="+")
+    flat_parser = commands.add_parser("flat", help="templates using a flat, as archive.record, e.g. 199.8 or 210.x")
+    flat_parser.add_argument("ids", nargs="+")
+    type_parser = commands.add_parser("building-type", help="templates of a BuildingType")
+    type_parser.add_argument("ids", nargs="+")
+    args = parser.parse_args()
+
+    index_file = args.index or os.path.join(args.directory, INDEX_FILE)
+    index = load_index(index_file) if args.no_update and args.command != "update" else {}
+    if "models" not in index:
+        index, scanned = update_index(args.directory, index_file)
+        if args.command == "update":
+            print(f"Index {index_file} updated, {scanned} file(s) scanned")
+            return
+
+    lookup = {"model": index["models"], "flat": index["flats"], "building-type": index["building_types"]}[args.command]
+    if args.json:
+        json.dump({key: lookup[key] for query in args.ids for key in match_keys(lookup, query)}, sys.stdout, indent=4)
+        print()
+        return
+
+    if args.command == "building-type":
+        total = print_templates(lookup, args.ids)
+    elif args.command == "model":
+        total = print_hits(lookup, args.ids, lambda hit: f"{hit[1]}[{hit[2]}]")
+    else:
+        total = print_hits(lookup, args.ids, lambda hit: f"{hit[1]}.{hit[2]}[{hit[3]}]")
+    if not total:
+        print("No templates found")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import re
+import sys
+
+# Built-in rule sets, one per model swap we have done on the building templates.
+# A rule maps a source pattern to a target pattern of the same length: digits
+# must match (or are written) literally, 'x' matches any digit and keeps it.
+# A set only applies to templates under its paths, relative to this folder
+# (Buildings); "" is the whole folder. Rules given with --rule apply everywhere.
+RULE_SETS = {
+    # Roofs: every 2xxx model becomes its 28xx replacement
+    "roofs": {"paths": [""], "rules": [("2xxx", "28xx")]},
+    # City Building Set, Type DB: brick walls 204xx become 201xx
+    "bricks": {"paths": ["City Building Set/Type DB"], "rules": [("204xx", "201xx")]},
+    # City Building Set, Type F: 191xx becomes 198xx
+    "type-f": {"paths": ["City Building Set/Type F"], "rules": [("191xx", "198xx")]},
+}
+
+BUILDINGS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Sections of RmbSubRecord whose Block3dObjectRecords are remapped
+SECTIONS = ("Exterior",)
+
+# Used to skip files that cannot contain a model we remap without parsing them
+MODEL_ID_PATTERN = re.compile(r'"ModelId(?:Num)?"\s*:\s*"?(\d+)')
+
+# Function to parse a "SOURCE=TARGET" rule from the command line
+def parse_rule(text):
+    source, sep, target = text.partition('=')
+    if not sep or len(source) != len(target) or not re.fullmatch(r'[\dx]+', source + target):
+        raise argparse.ArgumentTypeError(f"invalid rule '{text}', expected e.g. 204xx=201xx")
+    return source, target
+
+# Function to expand a rule into every model ID it matches
+def expand_rule(source, target):
+    wildcards = source.count('x')
+    for n in range(10 ** wildcards):
+        digits = iter(str(n).zfill(wildcards))
+        old = ''.join(next(digits) if c == 'x' else c for c in source)
+        new = ''.join(o if t == 'x' else t for o, t in zip(old, target))
+        yield old, new
+
+# Function to compile a table of rules into one lookup of old ID -> new ID.
+# Each record is looked up once, so rules never chain; the first rule that
+# matches an ID wins.
+def build_mapping(rules):
+    mapping = {}
+    for source, target in rules:
+        for old, new in expand_rule(source, target):
+            if old != new:
+                mapping.setdefault(old, new)
+    return mapping
+
+# Function to check whether a file is under one of the paths of a rule set; None is everywhere
+def in_scope(file_path, paths):
+    if paths is None:
+        return True
+    relative = os.path.relpath(os.path.abspath(file_path), BUILDINGS_DIR).replace(os.sep, '/')
+    if relative == '..' or relative.startswith('../'):
+        return False
+    return any(path == "" or relative.startswith(path.rstrip('/') + '/') for path in paths)
+
+# Function to get the lookup for one file from the (paths, mapping) scopes that
+# cover it. Scopes are merged in order, so the first rule that matches still wins.
+def scoped_mapping(file_path, scopes):
+    matched = [mapping for paths, mapping in scopes if in_scope(file_path, paths)]
+    if len(matched) == 1:
+        return matched[0]
+    merged = {}
+    for mapping in matched:
+        for old, new in mapping.items():
+            merged.setdefault(old, new)
+    return merged
+
+# Function to remap one Block3dObjectRecord, returning the (field, old, new) values it changed
+def update_model_id(record, mapping):
+    changes = []
+    model_id = record.get('ModelId')
+    if isinstance(model_id, str) and model_id in mapping:
+        record['ModelId'] = mapping[model_id]
+        changes.append(('ModelId', model_id, record['ModelId']))
+
+    model_id_num = record.get('ModelIdNum')
+    if isinstance(model_id_num, int) and str(model_id_num) in mapping:
+        record['ModelIdNum'] = int(mapping[str(model_id_num)])
+        changes.append(('ModelIdNum', model_id_num, record['ModelIdNum']))
+    return changes
+
+# Function to remap every record of a template, returning one change per field rewritten
+def remap_template(data, mapping):
+    changes = []
+    sub_record = data.get('RmbSubRecord') if isinstance(data, dict) else None
+    if not isinstance(sub_record, dict):
+        return changes
+    for section in SECTIONS:
+        records = (sub_record.get(section) or {}).get('Block3dObjectRecords') or []
+        for index, record in enumerate(records):
+            for field, old, new in update_model_id(record, mapping):
+                changes.append({"section": section, "record": index, "field": field, "old": old, "new": new})
+    return changes
+
+# Function to serialize a template the way the file was written: indent=4,
+# keeping its trailing newline and line endings
+def dump_like(data, raw):
+    text = json.dumps(data, indent=4)
+    if raw.endswith(b'\n'):
+        text += '\n'
+    if b'\r\n' in raw:
+        text = text.replace('\n', '\r\n')
+    return text.encode('utf-8')
+
+# Function to apply all rules that cover one file in a single read/parse/write.
+# Returns the changes; the file is only rewritten when writing is enabled
+# and the new bytes differ from what is on disk.
+def remap_file(file_path, scopes, write=True):
+    mapping = scoped_mapping(file_path, scopes)
+    if not mapping:
+        return []
+    with open(file_path, 'rb') as file:
+        raw = file.read()
+    text = raw.decode('utf-8')
+
+    # Most templates use none of the remapped models; don't parse those
+    if not any(match in mapping for match in MODEL_ID_PATTERN.findall(text)):
+        return []
+
+    data = json.loads(text)
+    changes = remap_template(data, mapping)
+    if changes and write:
+        new_raw = dump_like(data, raw)
+        if new_raw != raw:
+            with open(file_path, 'wb') as file:
+                file.write(new_raw)
+    return changes
+
+def find_json_files(directory):
+    for root, dirs, files in os.walk(directory):
+        for file in files:
+            if file.endswith('.json'):
+                yield os.path.join(root, file)
+
+def main():
+    parser = argparse.ArgumentParser(description="Remap ModelId/ModelIdNum in the Block3dObjectRecords of building templates.")
+    parser.add_argument("directory", nargs="?", default=".", help="directory searched recursively for templates (default: .)")
+    parser.add_argument("-s", "--set", dest="sets", action="append", default=[], choices=sorted(RULE_SETS), help="built-in rule set to apply; may be repeated")
+    parser.add_argument("-r", "--rule", dest="rules", action="append", default=[], type=parse_rule, metavar="SOURCE=TARGET", help="extra rule such as 204xx=201xx; may be repeated")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="list the records that would change without writing any file")
+    parser.add_argument("-c", "--changes", metavar="FILE", help="write the change set (file -> changed records) as JSON to FILE")
+    args = parser.parse_args()
+
+    if not args.sets and not args.rules:
+        parser.error("no rules given; use --set and/or --rule")
+    scopes = [(RULE_SETS[name]["paths"], build_mapping(RULE_SETS[name]["rules"])) for name in args.sets]
+    if args.rules:
+        scopes.append((None, build_mapping(args.rules)))
+
+    change_set = {}
+    errors = 0
+    for json_file in find_json_files(args.directory):
+        try:
+            changes = remap_file(json_file, scopes, write=not args.dry_run)
+        except Exception as e:
+            print(f"Error processing file {json_file}: {e}")
+            errors += 1
+            continue
+        if not changes:
+            continue
+
+        change_set[json_file] = changes
+        if args.dry_run:
+            print(f"Would update file: {json_file}")
+            for change in changes:
+                print(f"    {change['section']}[{change['record']}] {change['field']}: {change['old']} -> {change['new']}")
+        else:
+            print(f"Updated file: {json_file} ({len(changes)} change(s))")
+
+    if args.changes:
+        with open(args.changes, 'w') as f:
+            json.dump(change_set, f, indent=4)
+
+    print(f"{len(change_set)} file(s) {'would be updated' if args.dry_run else 'updated'}")
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
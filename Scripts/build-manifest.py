@@ -0,0 +1,188 @@
+import argparse
+import fnmatch
+import functools
+import json
+import os
+import re
+import sys
+import time
+
+# Builds the Files list of the .dfmod.json manifests from the asset tree instead of
+# by hand. Every manifest is a set of include and exclude patterns over paths
+# relative to the mod folder ('*' also matches '/', and case is ignored so that
+# *.png covers .PNG). Without --write the lists are only compared, and the exit
+# status is 1 if a manifest is out of date, so it can run before every commit.
+
+MOD_PATH = "Assets/Game/Mods/rmb-resource-pack/"
+
+# Folders searched for assets, and whether their subfolders are searched too.
+# The mod folder itself is only listed for modsettings.json and the catalogs.
+SCAN_DIRECTORIES = [("", False), ("Prefabs", True), ("CustomRuntimeMaterials", True),
+                    ("Assets/Textures", True), ("Assets/Materials", True), ("Scripts", False)]
+
+# Directory listings are cached by modification time, which changes whenever a file is added, removed or renamed
+CACHE_FILE = ".dfmod-cache.json"
+
+INCLUDE = [
+    "modsettings.json",
+    "rmb-resource-pack.dfmod.json",
+    "Scripts/*.cs",
+    "Prefabs/*.prefab",
+    "Prefabs/*/pattern.csv",
+    "CustomRuntimeMaterials/*.json",
+    "Assets/Materials/*.mat",
+    "Assets/Textures/*.png",
+    "Assets/Textures/*.xml",
+]
+
+EXCLUDE = [
+    # Replaced by RMBCropBillboardBatch.cs
+    "Scripts/RMBCropBillboard.cs",
+    # Textures and materials of the windmill and tent models, which are not in the pack yet
+    "Assets/Textures/Models/*",
+    "Assets/Materials/*Cloth.mat",
+    "Assets/Materials/*Metal.mat",
+    "Assets/Materials/Wood*.mat",
+    "Assets/Textures/Buildings/1401_[01]-0.png",
+    # Textures that ship without their XML settings
+    "Assets/Textures/Miscellaneous/1210_1[78]-0.xml",
+    "Assets/Textures/Miscellaneous/1230_*.xml",
+    "Assets/Textures/NPCs/1200_[01]-0.xml",
+    "Assets/Textures/NPCs/1200_2[5-9]-0.xml",
+    "Assets/Textures/NPCs/1200_3[0-8]-0.xml",
+    "Assets/Textures/NPCs/1200_4[34]-0.xml",
+    "Assets/Textures/NPCs/1200_5[01]-*.xml",
+    "Assets/Textures/NPCs/1200_52-0.png",
+]
+
+# The development version uses the "- Dev" hills and rocks instead of the released ones
+MANIFESTS = {
+    "rmb-resource-pack.dfmod.json": {
+        "include": INCLUDE,
+        "exclude": EXCLUDE + ["Prefabs/* - Dev/*"],
+    },
+    "rmb-resource-pack - dev version.dfmod.json": {
+        "include": INCLUDE,
+        "exclude": EXCLUDE + ["Prefabs/Hills/*", "Prefabs/Rocks/*"],
+    },
+}
+
+# Function to compile a list of patterns into one regular expression, once per list
+@functools.lru_cache(maxsize=None)
+def compile_patterns(patterns):
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns) or r'(?!)', re.IGNORECASE)
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+# Function to list the files of the scanned folders in one pass, with os.scandir
+# only called for folders that changed since the cached listing was made.
+# Returns the paths (relative to root) and the new cache.
+def scan_tree(root, cache):
+    files = []
+    new_cache = {}
+    stack = list(SCAN_DIRECTORIES)
+    while stack:
+        directory, recursive = stack.pop()
+        path = os.path.join(root, directory)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            continue
+        listing = cache.get(directory)
+        if listing is None or listing["mtime"] != mtime:
+            listing = {"mtime": mtime, "files": [], "dirs": []}
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    # Unity skips hidden files, and .meta files are never listed in a manifest
+                    if entry.name.startswith('.') or entry.name.endswith('.meta'):
+                        continue
+                    listing["dirs" if entry.is_dir() else "files"].append(entry.name)
+        new_cache[directory] = listing
+        prefix = directory + '/' if directory else ''
+        files.extend(prefix + name for name in listing["files"])
+        if recursive:
+            stack.extend((prefix + name, True) for name in listing["dirs"])
+    return files, new_cache
+
+# Function to select the files a manifest's rules include
+def select_files(files, rules):
+    include = compile_patterns(tuple(rules["include"]))
+    exclude = compile_patterns(tuple(rules["exclude"]))
+    return {path for path in files if include.match(path) and not exclude.match(path)}
+
+# Function to create a sorting key: the filename split into text and numeric parts (as in sort-catalog.py)
+def sorting_key(file_path):
+    parts = re.split(r'(\d+)', os.path.basename(file_path))
+    return [int(part) if part.isdigit() else part.lower() for part in parts]
+
+# Function to build the new Files list: listed files that still match keep their
+# place, so the diff of the manifest stays small, and new ones are added in order
+def merge_files(current, selected):
+    kept = [path for path in current if path[len(MOD_PATH):] in selected]
+    listed = set(kept)
+    added = sorted((MOD_PATH + path for path in selected if MOD_PATH + path not in listed), key=sorting_key)
+    return kept + added
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Files list of the mod manifests from the asset tree and show how it differs from the current one.")
+    parser.add_argument("manifests", nargs="*", help=f"manifests to build (default: {', '.join(MANIFESTS)})")
+    parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'), help="mod folder (default: the folder above Scripts)")
+    parser.add_argument("-w", "--write", action="store_true", help="write the new Files lists to the manifests")
+    parser.add_argument("--no-cache", action="store_true", help=f"scan every folder instead of reusing {CACHE_FILE}")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cache_path = os.path.join(args.root, CACHE_FILE)
+    cache = {} if args.no_cache else load_cache(cache_path)
+    files, new_cache = scan_tree(args.root, cache)
+    if new_cache != cache:
+        with open(cache_path, 'w') as f:
+            json.dump(new_cache, f)
+
+    out_of_date = 0
+    errors = 0
+    for name in args.manifests or MANIFESTS:
+        manifest_name = os.path.basename(name)
+        if manifest_name not in MANIFESTS:
+            print(f"Error processing file {name}: no rules for this manifest")
+            errors += 1
+            continue
+        manifest_path = os.path.join(args.root, manifest_name)
+        try:
+            with open(manifest_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error processing file {manifest_path}: {e}")
+            errors += 1
+            continue
+
+        current = data.get("Files", [])
+        files_list = merge_files(current, select_files(files, MANIFESTS[manifest_name]))
+        added = sorted(set(files_list) - set(current), key=sorting_key)
+        removed = sorted(set(current) - set(files_list), key=sorting_key)
+        for path in added:
+            print(f"+ {path}")
+        for path in removed:
+            print(f"- {path}")
+        print(f"{manifest_name}: {len(files_list)} files, {len(added)} added, {len(removed)} removed")
+
+        if added or removed:
+            if args.write:
+                data["Files"] = files_list
+                with open(manifest_path, 'w') as f:
+                    json.dump(data, f, indent=4)
+                print(f"Updated {manifest_path}")
+            else:
+                out_of_date += 1
+
+    print(f"Scanned {len(files)} files in {time.perf_counter() - start:.3f} s")
+    if errors or out_of_date:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+
+# Loads the catalogs into memory once and indexes them, so that looking entries up
+# by ID, Category, Subcategory, Tags or Label does not scan the lists every time.
+#
+#   catalogs = catalog_query.load()                 # models, flats and buildings
+#   catalogs.query(category="Hills", tag="grass")
+#   catalogs.query(label="juggler")                  # Label contains "juggler"
+#   catalogs.query(label_prefix="corner", catalog="rmbrp-buildings-catalog.json")
+#
+# Category, Subcategory, Tags and Label are compared without case and surrounding
+# spaces; IDs are compared exactly.
+
+CATALOGS = ["rmbrp-models-catalog.json", "rmbrp-flats-catalog.json", "rmbrp-buildings-catalog.json"]
+
+# Tags hold one or more words, separated by commas or spaces
+TAG_SEPARATOR = re.compile(r'[,\s]+')
+
+def normalize(text):
+    return str(text or "").strip().lower()
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class CatalogIndex:
+    def __init__(self):
+        self.entries = []
+        self.sources = []
+        # Each index maps a value to the set of positions in entries that have it
+        self.by_id = {}
+        self.by_category = {}
+        self.by_subcategory = {}
+        self.by_tag = {}
+        self.by_catalog = {}
+        self.by_trigram = {}
+        # (label, position) pairs kept sorted, so a prefix is found with a binary search
+        self.labels = []
+
+    # Function to add the entries of one catalog to the indexes
+    def add(self, catalog_name, entries):
+        for entry in entries:
+            position = len(self.entries)
+            self.entries.append(entry)
+            self.sources.append(catalog_name)
+            self.by_id.setdefault(str(entry.get("ID", "")), set()).add(position)
+            self.by_category.setdefault(normalize(entry.get("Category")), set()).add(position)
+            self.by_subcategory.setdefault(normalize(entry.get("Subcategory")), set()).add(position)
+            self.by_catalog.setdefault(catalog_name, set()).add(position)
+            for tag in set(TAG_SEPARATOR.split(normalize(entry.get("Tags")))) - {""}:
+                self.by_tag.setdefault(tag, set()).add(position)
+            label = normalize(entry.get("Label"))
+            for trigram in trigrams(label):
+                self.by_trigram.setdefault(trigram, set()).add(position)
+            self.labels.append((label, position))
+        self.labels.sort()
+
+    # Function to find the positions of entries whose label starts with prefix
+    def _label_prefix(self, prefix):
+        start = bisect.bisect_left(self.labels, (prefix,))
+        positions = set()
+        for label, position in self.labels[start:]:
+            if not label.startswith(prefix):
+                break
+            positions.add(position)
+        return positions
+
+    # Function to find the positions of entries whose label contains text. Entries that
+    # have all of the text's trigrams are candidates; each candidate is then checked.
+    def _label_contains(self, text):
+        if len(text) < 3:
+            return {position for label, position in self.labels if text in label}
+        groups = sorted((self.by_trigram.get(trigram, set()) for trigram in trigrams(text)), key=len)
+        candidates = groups[0].intersection(*groups[1:])
+        return {position for position in candidates if text in normalize(self.entries[position].get("Label"))}
+
+    # Function to find the entries matching every given condition, in catalog order
+    def query(self, id=None, category=None, subcategory=None, tag=None, label=None, label_prefix=None, catalog=None):
+        sets = []
+        if id is not None:
+            sets.append(self.by_id.get(str(id), set()))
+        if category is not None:
+            sets.append(self.by_category.get(normalize(category), set()))
+        if subcategory is not None:
+            sets.append(self.by_subcategory.get(normalize(subcategory), set()))
+        if tag is not None:
+            sets.append(self.by_tag.get(normalize(tag), set()))
+        if catalog is not None:
+            sets.append(self.by_catalog.get(os.path.basename(catalog), set()))
+        if label_prefix is not None:
+            sets.append(self._label_prefix(normalize(label_prefix)))
+        if label is not None:
+            sets.append(self._label_contains(normalize(label)))
+        if not sets:
+            return list(self.entries)
+        # Intersecting from the smallest set keeps the work proportional to the rarest condition
+        sets.sort(key=len)
+        positions = sets[0].intersection(*sets[1:])
+        return [self.entries[position] for position in sorted(positions)]
+
+    # Function to get the name of the catalog an entry was loaded from
+    def source(self, entry):
+        return next(self.sources[position] for position in self.by_id[str(entry.get("ID", ""))]
+                    if self.entries[position] is entry)
+
+    # Function to count the entries for each value of a field, e.g. counts("Category")
+    def counts(self, field):
+        index = {"ID": self.by_id, "Category": self.by_category, "Subcategory": self.by_subcategory,
+                 "Tags": self.by_tag}[field]
+        return {value: len(positions) for value, positions in sorted(index.items())}
+
+# Function to load catalogs into one index. The entries of a catalog are in its
+# _list (models and flats) or its list (buildings).
+def load(paths=None):
+    if paths is None:
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        paths = [os.path.join(root, name) for name in CATALOGS]
+    index = CatalogIndex()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        entries = data.get("_list", data.get("list"))
+        if entries is None:
+            raise ValueError(f"{path} has no _list or list")
+        index.add(os.path.basename(path), entries)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Find catalog entries by ID, category, subcategory, tag or label.")
+    parser.add_argument("--catalogs", nargs="+", metavar="FILE", help=f"catalogs to search (default: {', '.join(CATALOGS)})")
+    parser.add_argument("-i", "--id", help="entry ID, e.g. 52001 or 1200.2")
+    parser.add_argument("-c", "--category", help="category, e.g. Hills")
+    parser.add_argument("-s", "--subcategory", help="subcategory, e.g. 'Small - Flat - Grass'")
+    parser.add_argument("-t", "--tag", help="tag, e.g. grass")
+    parser.add_argument("-l", "--label", help="text the label contains")
+    parser.add_argument("-p", "--label-prefix", help="text the label starts with")
+    parser.add_argument("--catalog", help="only entries from this catalog, e.g. rmbrp-flats-catalog.json")
+    parser.add_argument("--count", choices=["ID", "Category", "Subcategory", "Tags"], help="print the number of entries for each value of this field instead")
+    parser.add_argument("--json", action="store_true", help="print the entries as JSON")
+    args = parser.parse_args()
+
+    try:
+        catalogs = load(args.catalogs)
+    except (OSError, ValueError) as e:
+        print(f"Error loading the catalogs: {e}")
+        sys.exit(1)
+
+    if args.count:
+        for value, count in catalogs.counts(args.count).items():
+            print(f"{count:>6}  {value}")
+        return
+
+    entries = catalogs.query(id=args.id, category=args.category, subcategory=args.subcategory, tag=args.tag,
+                             label=args.label, label_prefix=args.label_prefix, catalog=args.catalog)
+    if args.json:
+        print(json.dumps(entries, indent=4))
+        return
+    for entry in entries:
+        category = f"{str(entry.get('Category', '')).strip()} / {str(entry.get('Subcategory', '')).strip()}"
+        print(f"{str(entry.get('ID', '')):<10}{category:<50}{str(entry.get('Label', '')).strip():<40}{entry.get('Tags', '')}")
+    print(f"{len(entries)} entries")
+
+if __name__ == "__main__":
+    main()
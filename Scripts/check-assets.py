@@ -0,0 +1,169 @@
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+
+# Checks the manifests and catalogs against the files that are actually there.
+# The mod folder is indexed once (path -> size, mtime and the GUID from its .meta)
+# and every check is a set operation on that index, so nothing is looked up on
+# disk one path at a time.
+
+MOD_PATH = "Assets/Game/Mods/rmb-resource-pack/"
+MODELS_CATALOG = "rmbrp-models-catalog.json"
+FLATS_CATALOG = "rmbrp-flats-catalog.json"
+# The release manifest is the one the catalogs' assets must be shipped in
+RELEASE_MANIFEST = "rmb-resource-pack.dfmod.json"
+
+GUID_PATTERN = re.compile(r'^guid: ([0-9a-f]+)', re.M)
+
+# Function to read the GUID of an asset from its .meta file; it is on the second line
+def read_guid(meta_path):
+    with open(meta_path, 'r', encoding='utf-8', errors='replace') as f:
+        match = GUID_PATTERN.search(f.readline() + f.readline())
+    return match.group(1) if match else None
+
+# Function to index every file and folder below root in one walk. Returns a dict of
+# relative path -> {"size", "mtime", "guid"} (folders have no size) for the assets,
+# and the set of .meta files found.
+def build_index(root):
+    index = {}
+    metas = set()
+    for directory, dirs, files in os.walk(root):
+        # Unity skips hidden files and folders, and so does the index
+        dirs[:] = [name for name in dirs if not name.startswith('.')]
+        relative = os.path.relpath(directory, root).replace(os.sep, '/')
+        prefix = '' if relative == '.' else relative + '/'
+        for name in dirs:
+            index[prefix + name] = {"size": None, "mtime": None, "guid": None}
+        for name in files:
+            if name.startswith('.'):
+                continue
+            if name.endswith('.meta'):
+                metas.add(prefix + name)
+                continue
+            stat = os.stat(os.path.join(directory, name))
+            index[prefix + name] = {"size": stat.st_size, "mtime": stat.st_mtime, "guid": None}
+    for meta in metas:
+        asset = index.get(meta[:-len('.meta')])
+        if asset is not None:
+            asset["guid"] = read_guid(os.path.join(root, meta))
+    return index, metas
+
+def stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Function to check the tree itself: .meta files, GUIDs and the custom runtime materials
+def check_tree(index, metas):
+    assets = set(index)
+    prefabs = {path for path in assets if path.startswith('Prefabs/') and path.endswith('.prefab')}
+    prefab_ids = {stem(path) for path in prefabs}
+    guids = defaultdict(list)
+    for path, entry in index.items():
+        if entry["guid"]:
+            guids[entry["guid"]].append(path)
+    return {
+        "prefabs_without_meta": sorted(path for path in prefabs if path + '.meta' not in metas),
+        "meta_without_asset": sorted(meta for meta in metas if meta[:-len('.meta')] not in assets),
+        "duplicate_guids": {guid: sorted(paths) for guid, paths in sorted(guids.items()) if len(paths) > 1},
+        "materials_without_prefab": sorted(path for path in assets
+                                           if path.startswith('CustomRuntimeMaterials/') and path.endswith('.json')
+                                           and stem(path) not in prefab_ids),
+    }
+
+# Function to check one manifest: every listed file must exist and have a .meta
+def check_manifest(files, index, metas):
+    listed = {path[len(MOD_PATH):] if path.startswith(MOD_PATH) else path for path in files}
+    missing = listed - index.keys()
+    return {
+        "missing_files": sorted(MOD_PATH + path for path in missing),
+        "files_without_meta": sorted(MOD_PATH + path for path in listed - missing if path + '.meta' not in metas),
+        "duplicate_entries": len(files) - len(set(files)),
+    }
+
+# Function to check the catalogs against the release manifest: each model ID needs a
+# shipped prefab, and each flat (archive.record) a shipped texture for frame 0
+def check_catalogs(root, shipped):
+    prefab_ids = {stem(path) for path in shipped if path.endswith('.prefab')}
+    texture_names = {stem(path).lower() for path in shipped if path.lower().endswith('.png')}
+    models = load_json(os.path.join(root, MODELS_CATALOG))["_list"]
+    flats = load_json(os.path.join(root, FLATS_CATALOG))["_list"]
+    return {
+        "models_without_prefab": sorted(str(entry["ID"]) for entry in models if str(entry["ID"]) not in prefab_ids),
+        "flats_without_texture": sorted(str(entry["ID"]) for entry in flats
+                                        if str(entry["ID"]).replace('.', '_') + '-0' not in texture_names),
+    }
+
+# Function to count the problems in a report section
+def count_problems(section):
+    return sum(value if isinstance(value, int) else len(value) for value in section.values())
+
+def print_section(name, section):
+    for check, problems in section.items():
+        count = problems if isinstance(problems, int) else len(problems)
+        if not count:
+            continue
+        print(f"{name}: {check} ({count})")
+        if isinstance(problems, dict):
+            for key, paths in problems.items():
+                print(f"    {key}: {', '.join(paths)}")
+        elif isinstance(problems, list):
+            for problem in problems:
+                print(f"    {problem}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the files listed in the mod manifests and catalogs exist and have their .meta files.")
+    parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'), help="mod folder (default: the folder above Scripts)")
+    parser.add_argument("--json", metavar="FILE", help="write the report as JSON to FILE, or - for standard output")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index, metas = build_index(args.root)
+    report = {"files": len(index), "tree": check_tree(index, metas), "manifests": {}}
+    errors = 0
+    shipped = None
+    for manifest_path in sorted(glob.glob(os.path.join(args.root, '*.dfmod.json'))):
+        name = os.path.basename(manifest_path)
+        try:
+            files = load_json(manifest_path)["Files"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error processing file {manifest_path}: {e}")
+            errors += 1
+            continue
+        report["manifests"][name] = check_manifest(files, index, metas)
+        if name == RELEASE_MANIFEST:
+            shipped = files
+    if shipped is not None:
+        try:
+            report["catalogs"] = check_catalogs(args.root, shipped)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error processing the catalogs: {e}")
+            errors += 1
+    sections = [("tree", report["tree"])] + list(report["manifests"].items())
+    if "catalogs" in report:
+        sections.append(("catalogs", report["catalogs"]))
+    problems = sum(count_problems(section) for name, section in sections)
+    report["problems"] = problems
+    report["seconds"] = round(time.perf_counter() - start, 3)
+
+    if args.json == '-':
+        print(json.dumps(report, indent=4))
+    else:
+        for name, section in sections:
+            print_section(name, section)
+        print(f"Checked {len(index)} files in {report['seconds']:.3f} s: {problems} problem(s)")
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=4)
+    if errors or problems:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+import zlib
+from array import array
+
+import fbx_binary
+
+# Function to scale the vertices of every mesh geometry, returning the vertices scaled.
+# Like scaling the objects in Blender and applying the scale, only the vertex
+# positions change; object locations and normals are left as they are.
+def scale_vertices(fbx, factor):
+    count = 0
+    for geometry in fbx.find_all('Geometry'):
+        vertices = geometry.find('Vertices')
+        if vertices is None:
+            continue
+        prop = vertices.properties[0]
+        prop.value = array(prop.value.typecode, (value * factor for value in prop.value))
+        count += len(prop.value) // 3
+    return count
+
+# Function to read the unit scale the file was exported with (1.0 is centimetres)
+def unit_scale(fbx):
+    entry = fbx_binary.properties70(fbx.find('GlobalSettings')).get('UnitScaleFactor')
+    return entry.properties[4].value if entry else None
+
+def find_fbx_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                for file in sorted(files):
+                    if file.lower().endswith('.fbx'):
+                        yield os.path.join(root, file)
+        else:
+            yield path
+
+def main():
+    parser = argparse.ArgumentParser(description="Scale the meshes of binary FBX files without going through Blender.")
+    parser.add_argument("paths", nargs="+", help="FBX files, or directories searched recursively for them")
+    parser.add_argument("-s", "--scale", type=float, default=100.0, help="factor for the vertex positions (default: 100)")
+    parser.add_argument("--suffix", help="write FILE<suffix>.fbx next to each file instead of scaling it in place, e.g. _scaled")
+    parser.add_argument("--info", action="store_true", help="only print the unit scale and vertex count of each file")
+    args = parser.parse_args()
+
+    errors = 0
+    for fbx_file_path in find_fbx_files(args.paths):
+        if args.suffix and os.path.splitext(fbx_file_path)[0].endswith(args.suffix):
+            continue
+        try:
+            fbx = fbx_binary.read(fbx_file_path)
+            if args.info:
+                vertices = sum(len(node.properties[0].value) // 3 for node in fbx.find_all('Vertices'))
+                print(f"{fbx_file_path}: unit scale {unit_scale(fbx)}, {vertices} vertices")
+                continue
+            count = scale_vertices(fbx, args.scale)
+            output_path = os.path.splitext(fbx_file_path)[0] + args.suffix + '.fbx' if args.suffix else fbx_file_path
+            fbx.write(output_path)
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"Error processing file {fbx_file_path}: {e}")
+            errors += 1
+            continue
+        print(f"Scaled and re-exported: {output_path} ({count} vertices)")
+
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
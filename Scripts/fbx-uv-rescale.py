@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import zlib
+
+import numpy as np
+
+import fbx_binary
+
+# Function to scale the UV array (the first property of a "UV" node) in place
+def scale_uv_node(node, u_scale, v_scale):
+    prop = node.properties[0]
+    if prop.kind not in ('d', 'f'):
+        raise ValueError(f"UV array has unexpected type {prop.kind!r}")
+    uvs = np.frombuffer(prop.array_bytes(), dtype='<f8' if prop.kind == 'd' else '<f4').copy()
+    uvs[0::2] *= u_scale
+    uvs[1::2] *= v_scale
+    prop.set_array_bytes(uvs.tobytes())
+    return len(uvs) // 2
+
+# Function to rescale every LayerElementUV of every geometry in the file, returning the UVs scaled
+def rescale_uvs(fbx, u_scale, v_scale):
+    count = 0
+    for node in fbx.find_all('LayerElementUV'):
+        for child in node.children:
+            if child.name == 'UV':
+                count += scale_uv_node(child, u_scale, v_scale)
+    return count
+
+# Main function to process one FBX file; writes to output_path, or in place if it is None
+def process_fbx(fbx_file_path, u_scale, v_scale, output_path=None):
+    fbx = fbx_binary.read(fbx_file_path)
+    count = rescale_uvs(fbx, u_scale, v_scale)
+    fbx.write(output_path or fbx_file_path)
+    return count
+
+def find_fbx_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                for file in sorted(files):
+                    if file.lower().endswith('.fbx'):
+                        yield os.path.join(root, file)
+        else:
+            yield path
+
+def main():
+    parser = argparse.ArgumentParser(description="Rescale the UVs of binary FBX meshes without going through Blender.")
+    parser.add_argument("paths", nargs="+", help="FBX files, or directories searched recursively for them")
+    parser.add_argument("-s", "--scale", type=float, default=0.5, help="factor for both U and V (default: 0.5)")
+    parser.add_argument("-u", "--u-scale", type=float, help="factor for U only, overriding --scale")
+    parser.add_argument("-v", "--v-scale", type=float, help="factor for V only, overriding --scale")
+    parser.add_argument("--suffix", help="write FILE<suffix>.fbx next to each file instead of rescaling it in place, e.g. _rescaled")
+    args = parser.parse_args()
+
+    u_scale = args.scale if args.u_scale is None else args.u_scale
+    v_scale = args.scale if args.v_scale is None else args.v_scale
+    errors = 0
+    for fbx_file_path in find_fbx_files(args.paths):
+        output_path = None
+        if args.suffix:
+            if os.path.splitext(fbx_file_path)[0].endswith(args.suffix):
+                continue
+            output_path = os.path.splitext(fbx_file_path)[0] + args.suffix + '.fbx'
+        try:
+            count = process_fbx(fbx_file_path, u_scale, v_scale, output_path)
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"Error processing file {fbx_file_path}: {e}")
+            errors += 1
+            continue
+        print(f"Processed {output_path or fbx_file_path} ({count} UV(s) scaled)")
+
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+# Reader/writer for binary FBX files (7.x), without Blender.
+#
+#   fbx = fbx_binary.read("Rock_01.fbx")
+#   for uv in fbx.find_all("UV"):
+#       uvs = uv.properties[0].value        # array('d'), decoded on first use
+#       uv.properties[0].value = array('d', (x * 2 for x in uvs))
+#   fbx.write("Rock_01.fbx")
+#
+# The file is kept as the bytes it was read from: a property is only decoded when
+# it is used, and only nodes whose properties changed are encoded again, so
+# everything else is written back byte for byte.
+
+# Binary FBX files start with this magic, followed by a uint32 version
+FBX_MAGIC = b"Kaydara FBX Binary  \x00\x1a\x00"
+HEADER_SIZE = len(FBX_MAGIC) + 4
+
+# Struct formats of the fixed-size property types
+SCALAR_FORMATS = {'Y': '<h', 'C': '<?', 'I': '<i', 'F': '<f', 'D': '<d', 'L': '<q'}
+# Array property types and the array typecodes they decode to
+ARRAY_TYPECODES = {'d': 'd', 'f': 'f', 'l': 'q', 'i': 'i', 'b': 'b'}
+ARRAY_ITEM_SIZES = {'d': 8, 'f': 4, 'l': 8, 'i': 4, 'b': 1}
+
+# Footer: an ID block, zero padding, the version, 120 zero bytes and a 16-byte magic
+FOOTER_ID_SIZE = 16
+FOOTER_TAIL_SIZE = 4 + 120 + 16
+
+# A property of a node. The raw bytes (after the type code) are decoded into
+# value on first access; a value that was set is encoded again when written.
+class Property:
+    def __init__(self, kind, raw):
+        self.kind = kind
+        self._raw = raw
+        self._value = None
+        self.modified = False
+
+    # Function to get the array's bytes (little-endian, uncompressed) without building an array
+    def array_bytes(self):
+        if self.kind not in ARRAY_TYPECODES:
+            raise TypeError(f"property of type '{self.kind}' is not an array")
+        if self.modified:
+            return self._array_to_bytes(self._value)
+        length, encoding, stored_length = struct.unpack_from('<III', self._raw)
+        stored = self._raw[12:12 + stored_length]
+        return zlib.decompress(stored) if encoding == 1 else bytes(stored)
+
+    # Function to get the number of items in an array from its header, without decoding it
+    def array_length(self):
+        if self.kind not in ARRAY_TYPECODES:
+            raise TypeError(f"property of type '{self.kind}' is not an array")
+        if self.modified:
+            return len(self._value)
+        return struct.unpack_from('<I', self._raw)[0]
+
+    # Function to replace the array with little-endian bytes of the same item type
+    def set_array_bytes(self, raw):
+        self.value = self._bytes_to_array(raw)
+
+    @property
+    def value(self):
+        if self._value is None and not self.modified:
+            self._value = self._decode()
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = value
+        self.modified = True
+
+    def _bytes_to_array(self, raw):
+        values = array(ARRAY_TYPECODES[self.kind])
+        values.frombytes(raw)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    def _array_to_bytes(self, values):
+        values = array(ARRAY_TYPECODES[self.kind], values)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tobytes()
+
+    def _decode(self):
+        if self.kind in SCALAR_FORMATS:
+            return struct.unpack_from(SCALAR_FORMATS[self.kind], self._raw)[0]
+        if self.kind in ARRAY_TYPECODES:
+            return self._bytes_to_array(self.array_bytes())
+        if self.kind == 'S':
+            return bytes(self._raw[4:]).decode('utf-8', 'surrogateescape')
+        return bytes(self._raw[4:])
+
+    # Function to encode the property, type code included. Unchanged properties
+    # are copied; a changed array keeps the encoding (raw or zlib) it was read with.
+    def encode(self):
+        kind = self.kind.encode('ascii')
+        if not self.modified:
+            return kind + self._raw
+        if self.kind in SCALAR_FORMATS:
+            return kind + struct.pack(SCALAR_FORMATS[self.kind], self._value)
+        if self.kind in ARRAY_TYPECODES:
+            raw = self._array_to_bytes(self._value)
+            encoding = struct.unpack_from('<I', self._raw, 4)[0] if self._raw else 0
+            stored = zlib.compress(raw) if encoding == 1 else raw
+            return kind + struct.pack('<III', len(raw) // ARRAY_ITEM_SIZES[self.kind], encoding, len(stored)) + stored
+        data = self._value.encode('utf-8', 'surrogateescape') if self.kind == 'S' else bytes(self._value)
+        return kind + struct.pack('<I', len(data)) + data
+
+# Function to split a node's raw property bytes into its properties
+def parse_properties(raw, count, node_name):
+    properties = []
+    offset = 0
+    for _ in range(count):
+        kind = chr(raw[offset])
+        offset += 1
+        if kind in SCALAR_FORMATS:
+            size = struct.calcsize(SCALAR_FORMATS[kind])
+        elif kind in ARRAY_TYPECODES:
+            size = 12 + struct.unpack_from('<III', raw, offset)[2]
+        elif kind in ('S', 'R'):
+            size = 4 + struct.unpack_from('<I', raw, offset)[0]
+        else:
+            raise ValueError(f"unknown property type {kind!r} in node {node_name}")
+        properties.append(Property(kind, raw[offset:offset + size]))
+        offset += size
+    return properties
+
+# A node of the FBX tree; its properties are only split up when first used
+class Node:
+    def __init__(self, name, num_properties, raw_properties, children, has_sentinel):
+        self.name = name
+        self.children = children
+        self.has_sentinel = has_sentinel
+        self._num_properties = num_properties
+        self._raw_properties = raw_properties
+        self._properties = None
+
+    @property
+    def properties(self):
+        if self._properties is None:
+            self._properties = parse_properties(self._raw_properties, self._num_properties, self.name)
+        return self._properties
+
+    @properties.setter
+    def properties(self, properties):
+        self._properties = list(properties)
+
+    def encode_properties(self):
+        if self._properties is None:
+            return self._raw_properties, self._num_properties
+        if len(self._properties) == self._num_properties and not any(prop.modified for prop in self._properties):
+            return self._raw_properties, self._num_properties
+        return b''.join(prop.encode() for prop in self._properties), len(self._properties)
+
+    # Function to get the first child with this name, or None
+    def find(self, name):
+        return next((child for child in self.children if child.name == name), None)
+
+    # Function to walk the subtree below this node, depth first
+    def walk(self):
+        for child in self.children:
+            yield child
+            yield from child.walk()
+
+    def __repr__(self):
+        return f"Node({self.name!r}, {self._num_properties} properties, {len(self.children)} children)"
+
+# A whole FBX file: the version, the top-level nodes and the footer bytes
+class FbxFile:
+    def __init__(self, version, nodes, footer, original_length=None):
+        self.version = version
+        self.nodes = nodes
+        self.footer = footer
+        self.original_length = original_length
+
+    # Function to find a top-level node, e.g. "Objects" or "GlobalSettings"
+    def find(self, name):
+        return next((node for node in self.nodes if node.name == name), None)
+
+    def walk(self):
+        for node in self.nodes:
+            yield node
+            yield from node.walk()
+
+    # Function to find every node with this name, at any depth
+    def find_all(self, name):
+        return [node for node in self.walk() if node.name == name]
+
+    def to_bytes(self):
+        header = node_header_format(self.version)
+        out = bytearray(FBX_MAGIC + struct.pack('<I', self.version))
+        for node in self.nodes:
+            write_node(out, node, header)
+        out += bytes(struct.calcsize(header))
+        footer = self.footer
+        if self.original_length is not None and len(out) + len(footer) != self.original_length:
+            footer = realign_footer(footer, len(out) + len(footer) - self.original_length)
+        return bytes(out + footer)
+
+    # Function to write the file, through a temporary file so a failed write leaves the old one intact
+    def write(self, path):
+        data = self.to_bytes()
+        temp_path = path + '.writing'
+        with open(temp_path, 'wb') as file:
+            file.write(data)
+        os.replace(temp_path, path)
+
+# Function to get the header layout for a file version: 7500 and up use 64-bit offsets
+def node_header_format(version):
+    return '<QQQB' if version >= 7500 else '<IIIB'
+
+# Function to read one node (and its children) starting at offset.
+# Returns the node, or None for the null record that ends a list of nodes.
+def read_node(data, offset, header):
+    end_offset, num_properties, properties_length, name_length = struct.unpack_from(header, data, offset)
+    if end_offset == 0:
+        return None, offset + struct.calcsize(header)
+    if end_offset > len(data):
+        raise ValueError(f"node at {offset} ends past the end of the file")
+    offset += struct.calcsize(header)
+    name = bytes(data[offset:offset + name_length]).decode('latin-1')
+    offset += name_length
+    raw_properties = data[offset:offset + properties_length]
+    offset += properties_length
+
+    children = []
+    has_sentinel = False
+    while offset < end_offset:
+        child, offset = read_node(data, offset, header)
+        if child is None:
+            has_sentinel = True
+            break
+        children.append(child)
+    if offset != end_offset:
+        raise ValueError(f"node {name} ends at {offset}, expected {end_offset}")
+    return Node(name, num_properties, raw_properties, children, has_sentinel), end_offset
+
+# Function to parse a binary FBX file from bytes, a memoryview or an mmap.
+# Nodes keep views into data, so it must stay open while the file is used.
+def parse(data):
+    data = memoryview(data)
+    error = None
+    try:
+        if bytes(data[:len(FBX_MAGIC)]) != FBX_MAGIC:
+            raise ValueError("not a binary FBX file")
+        version = struct.unpack_from('<I', data, len(FBX_MAGIC))[0]
+        header = node_header_format(version)
+        nodes = []
+        offset = HEADER_SIZE
+        while True:
+            node, offset = read_node(data, offset, header)
+            if node is None:
+                break
+            nodes.append(node)
+    except struct.error as e:
+        error = f"truncated FBX file: {e}"
+    except ValueError as e:
+        error = str(e)
+    if error is not None:
+        # Only the message is kept: the traceback would hold views into data, and
+        # an mmap with views left cannot be closed. The partial nodes go as well.
+        nodes = node = None
+        data.release()
+        raise ValueError(error)
+    return FbxFile(version, nodes, bytes(data[offset:]), len(data))
+
+def read(path):
+    with open(path, 'rb') as file:
+        return parse(file.read())
+
+# Function to append a node (and its children) to out, with offsets for its position in the file
+def write_node(out, node, header):
+    start = len(out)
+    raw_properties, num_properties = node.encode_properties()
+    name = node.name.encode('latin-1')
+    out += struct.pack(header, 0, num_properties, len(raw_properties), len(name))
+    out += name
+    out += raw_properties
+    for child in node.children:
+        write_node(out, child, header)
+    if node.has_sentinel:
+        out += bytes(struct.calcsize(header))
+    struct.pack_into(header, out, start, len(out), num_properties, len(raw_properties), len(name))
+
+# Function to re-pad the footer after the node list moved by shift bytes. The
+# padding keeps the version at the same offset modulo 16 as in the original
+# file. Blender pads a full 16 bytes rather than none, so an aligned position
+# keeps whichever the file used.
+def realign_footer(footer, shift):
+    head = footer[:FOOTER_ID_SIZE]
+    tail = footer[-FOOTER_TAIL_SIZE:]
+    old_padding = len(footer) - len(head) - len(tail)
+    if old_padding < 0:
+        return footer
+    padding = (old_padding - shift) % 16
+    if padding == 0 and old_padding == 16:
+        padding = 16
+    return head + bytes(padding) + tail
+
+# Function to map the name of every Properties70 entry ("P" node) of a node to that entry,
+# e.g. properties70(fbx.find("GlobalSettings"))["UnitScaleFactor"]
+def properties70(node):
+    block = node.find("Properties70") if node is not None else None
+    return {entry.properties[0].value: entry for entry in block.children if entry.name == "P"} if block else {}
+
+# Function to set the value(s) of a Properties70 entry; they follow its name, type, label and flags
+def set_property70(entry, *values):
+    for prop, value in zip(entry.properties[4:], values):
+        prop.value = value
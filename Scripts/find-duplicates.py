@@ -0,0 +1,229 @@
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Files this small are hashed in one go; larger ones are first compared on their first block
+BLOCK_SIZE = 1 << 16
+
+# The Files of a .dfmod.json manifest are listed under this path (as in build-manifest.py)
+MOD_PATH = "Assets/Game/Mods/rmb-resource-pack/"
+
+# Unity files that refer to other assets by the GUID in their .meta
+REFERENCE_EXTENSIONS = {'.prefab', '.mat', '.asset', '.unity', '.controller'}
+GUID_PATTERN = re.compile(rb'guid: ([0-9a-f]{32})')
+
+# Function to walk the pack once, returning (path, size) for every file.
+# Hidden files and folders (.git, indexes) and Unity .meta files are skipped:
+# .meta files are unique by GUID, and Unity ignores hidden entries.
+def scan_files(start_path, extensions=None):
+    found = []
+    stack = [start_path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and not entry.name.endswith('.meta'):
+                    if extensions and os.path.splitext(entry.name)[1].lower() not in extensions:
+                        continue
+                    found.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+    return found
+
+# Function to hash a file, streamed in blocks; limit hashes only the first bytes
+def file_hash(filepath, limit=None):
+    hasher = hashlib.sha256()
+    remaining = limit
+    with open(filepath, 'rb') as file:
+        while remaining is None or remaining > 0:
+            chunk = file.read(BLOCK_SIZE if remaining is None else min(BLOCK_SIZE, remaining))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return hasher.hexdigest()
+
+# Function to split groups of candidate files further by a key computed in parallel,
+# dropping every file that ends up alone
+def refine(groups, key, executor):
+    values = executor.map(key, [path for group in groups for path in group])
+    refined = []
+    for group in groups:
+        by_value = {}
+        for path in group:
+            by_value.setdefault(next(values), []).append(path)
+        refined.extend(paths for paths in by_value.values() if len(paths) > 1)
+    return refined
+
+# Function to find byte-identical files: group by size, then by the hash of the
+# first block, then by the full hash. Only files that still collide are read further.
+def find_identical(files, jobs):
+    by_size = {}
+    for path, size in files:
+        if size:
+            by_size.setdefault(size, []).append(path)
+    small = [sorted(group) for size, group in by_size.items() if len(group) > 1 and size <= BLOCK_SIZE]
+    large = [sorted(group) for size, group in by_size.items() if len(group) > 1 and size > BLOCK_SIZE]
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        large = refine(large, lambda path: file_hash(path, BLOCK_SIZE), executor)
+        return refine(small + large, file_hash, executor)
+
+# Function to hash what a JSON file means rather than how it is written; runs in worker processes
+def json_content_hash(filepath):
+    try:
+        with open(filepath, 'rb') as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+# Function to find JSON files with the same content that are not byte-identical
+def find_json_equivalent(files, identical, jobs):
+    paths = sorted(path for path, size in files if path.lower().endswith('.json'))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        hashes = executor.map(json_content_hash, paths, chunksize=max(1, len(paths) // (jobs * 4)))
+        by_content = {}
+        for path, content in zip(paths, hashes):
+            if content is not None:
+                by_content.setdefault(content, []).append(path)
+
+    # A group that is one set of byte-identical files is already reported
+    identical_sets = {frozenset(group) for group in identical}
+    return [group for group in by_content.values() if len(group) > 1 and frozenset(group) not in identical_sets]
+
+# Function to find the files the mod manifests list, as absolute paths
+def manifest_files(root):
+    listed = set()
+    for name in os.listdir(root):
+        if name.endswith('.dfmod.json'):
+            with open(os.path.join(root, name), 'r') as f:
+                for path in json.load(f).get("Files", []):
+                    if path.startswith(MOD_PATH):
+                        listed.add(os.path.abspath(os.path.join(root, path[len(MOD_PATH):])))
+    return listed
+
+# Function to collect every GUID the prefabs, materials and other Unity assets refer to
+def referenced_guids(root, jobs):
+    def guids(path):
+        with open(path, 'rb') as file:
+            return GUID_PATTERN.findall(file.read())
+    paths = [path for path, size in scan_files(root, REFERENCE_EXTENSIONS)]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return {guid.decode('ascii') for found in executor.map(guids, paths) for guid in found}
+
+def meta_guid(path):
+    try:
+        with open(path + '.meta', 'rb') as file:
+            match = re.search(rb'^guid: ([0-9a-f]{32})', file.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return match.group(1).decode('ascii') if match else None
+
+# Function to choose the copy of a group to keep: one listed in a manifest, else one
+# matching a --keep pattern. Returns None when neither says which copy is the real one.
+def choose_kept(group, listed, keep_patterns, directory):
+    for path in group:
+        if os.path.abspath(path) in listed:
+            return path
+    for path in group:
+        relative = os.path.relpath(path, directory).replace(os.sep, '/')
+        if any(fnmatch.fnmatch(relative, pattern) for pattern in keep_patterns):
+            return path
+    return None
+
+# Function to replace every duplicate in a group with a hard link to the kept file
+def link_duplicates(group, original):
+    for duplicate in group:
+        if duplicate == original or os.path.samefile(original, duplicate):
+            continue
+        temp_path = duplicate + '.linking'
+        os.link(original, temp_path)
+        os.replace(temp_path, duplicate)
+        print(f'Linked {duplicate} -> {original}')
+
+# Function to delete every duplicate in a group but the kept file, with its Unity .meta.
+# Files a manifest lists, or whose GUID another asset refers to, are never deleted:
+# that would break the mod or the prefabs and materials that use them.
+def delete_duplicates(group, original, listed, guids):
+    for duplicate in group:
+        if duplicate == original:
+            continue
+        if os.path.abspath(duplicate) in listed:
+            print(f'Kept {duplicate}: it is listed in a mod manifest')
+            continue
+        if meta_guid(duplicate) in guids:
+            print(f'Kept {duplicate}: its GUID is referenced by another asset')
+            continue
+        os.remove(duplicate)
+        if os.path.exists(duplicate + '.meta'):
+            os.remove(duplicate + '.meta')
+        print(f'Deleted duplicate file: {duplicate}')
+
+def print_groups(title, groups, sizes):
+    print(f"{title}: {len(groups)} group(s)")
+    for group in groups:
+        print(f"  {len(group)} x {sizes[group[0]]} bytes")
+        for path in group:
+            print(f"    {path}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate files across the resource pack.")
+    parser.add_argument("directory", nargs="?", default=".", help="directory to search (default: .)")
+    parser.add_argument("-e", "--ext", action="append", help="only look at files with this extension, e.g. .png; may be repeated")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="parallel hashing jobs (default: all cores)")
+    parser.add_argument("--no-json", action="store_true", help="skip the search for JSON files with identical content but different formatting")
+    parser.add_argument("--report", metavar="FILE", help="also write the duplicate groups as JSON to FILE")
+    action = parser.add_mutually_exclusive_group()
+    action.add_argument("--link", action="store_true", help="replace byte-identical duplicates with hard links to the first copy")
+    action.add_argument("--delete", action="store_true", help="delete byte-identical duplicates (and their .meta) that no manifest lists and no asset refers to")
+    parser.add_argument("--keep", action="append", default=[], metavar="PATTERN", help="with --link or --delete, keep the copy whose path (relative to the directory) matches this, e.g. 'Final/*', when no copy is listed in a manifest; may be repeated")
+    parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'), help="mod folder with the manifests and assets to check before deleting (default: the folder above Scripts)")
+    args = parser.parse_args()
+
+    extensions = {ext.lower() if ext.startswith('.') else '.' + ext.lower() for ext in args.ext} if args.ext else None
+    files = scan_files(args.directory, extensions)
+    sizes = dict(files)
+
+    identical = find_identical(files, args.jobs)
+    identical.sort(key=lambda group: sizes[group[0]] * (len(group) - 1), reverse=True)
+    equivalent = [] if args.no_json else find_json_equivalent(files, identical, args.jobs)
+
+    wasted = sum(sizes[group[0]] * (len(group) - 1) for group in identical)
+    print_groups("Byte-identical files", identical, sizes)
+    if not args.no_json:
+        print_groups("JSON files with identical content", equivalent, sizes)
+    print(f"Scanned {len(files)} file(s); {sum(len(group) - 1 for group in identical)} duplicate(s) waste {wasted} bytes")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({"identical": identical, "json_equivalent": equivalent, "wasted_bytes": wasted}, f, indent=4)
+
+    if args.link or args.delete:
+        try:
+            listed = manifest_files(args.root)
+            guids = referenced_guids(args.root, args.jobs) if args.delete else set()
+        except (OSError, ValueError) as e:
+            print(f"Error reading the mod folder {args.root}: {e}")
+            sys.exit(1)
+        for group in identical:
+            original = choose_kept(group, listed, args.keep, args.directory)
+            if original is None:
+                print(f"Skipped {len(group)} copies of {os.path.basename(group[0])}: none is listed in a manifest or matches --keep")
+                continue
+            try:
+                link_duplicates(group, original) if args.link else delete_duplicates(group, original, listed, guids)
+            except OSError as e:
+                print(f"Error processing {group[0]}: {e}")
+                sys.exit(1)
+
+if __name__ == "__main__":
+    main()
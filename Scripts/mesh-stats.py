@@ -0,0 +1,144 @@
+import argparse
+import csv
+import json
+import mmap
+import os
+import re
+import sys
+import zlib
+
+import fbx_binary
+
+MESH_EXTENSIONS = ('.fbx', '.obj')
+COLUMNS = ("path", "format", "bytes", "geometries", "vertices", "polygons", "triangles", "materials",
+           "uv_min_u", "uv_min_v", "uv_max_u", "uv_max_v")
+
+# OBJ lines we count; everything else (normals, groups, comments) is skipped unread
+OBJ_VERTEX = re.compile(rb'^v\s', re.M)
+OBJ_UV = re.compile(rb'^vt\s+(\S+)\s+(\S+)', re.M)
+OBJ_FACE = re.compile(rb'^f\s+([^\r\n]*)', re.M)
+OBJ_MATERIAL = re.compile(rb'^usemtl\s+([^\r\n]*)', re.M)
+OBJ_GROUP = re.compile(rb'^[og]\s', re.M)
+
+# Function to widen the UV bounds in stats with a list of u and v values
+def add_uv_bounds(stats, us, vs):
+    if not us:
+        return
+    stats["uv_min_u"] = min(stats["uv_min_u"], min(us)) if stats["uv_min_u"] is not None else min(us)
+    stats["uv_min_v"] = min(stats["uv_min_v"], min(vs)) if stats["uv_min_v"] is not None else min(vs)
+    stats["uv_max_u"] = max(stats["uv_max_u"], max(us)) if stats["uv_max_u"] is not None else max(us)
+    stats["uv_max_v"] = max(stats["uv_max_v"], max(vs)) if stats["uv_max_v"] is not None else max(vs)
+
+def empty_stats(path, kind, size):
+    stats = dict.fromkeys(COLUMNS, 0)
+    stats.update({"path": path, "format": kind, "bytes": size, "uv_min_u": None, "uv_min_v": None, "uv_max_u": None, "uv_max_v": None})
+    return stats
+
+# Function to measure an FBX file. Vertex counts come from the array headers; only
+# the polygon indices and UVs are decompressed, everything else stays undecoded.
+def fbx_stats(data, stats):
+    fbx = fbx_binary.parse(data)
+    for geometry in fbx.find_all('Geometry'):
+        vertices = geometry.find('Vertices')
+        if vertices is None:
+            continue
+        stats["geometries"] += 1
+        stats["vertices"] += vertices.properties[0].array_length() // 3
+        indices = geometry.find('PolygonVertexIndex')
+        if indices is not None:
+            # Each polygon's last index is stored negated; an n-gon makes n - 2 triangles
+            values = indices.properties[0].value
+            polygons = sum(1 for index in values if index < 0)
+            stats["polygons"] += polygons
+            stats["triangles"] += len(values) - 2 * polygons
+        for layer in geometry.children:
+            uv = layer.find('UV') if layer.name == 'LayerElementUV' else None
+            if uv is not None:
+                uvs = uv.properties[0].value
+                add_uv_bounds(stats, uvs[0::2], uvs[1::2])
+    stats["materials"] = len(fbx.find_all('Material'))
+
+# Function to measure an OBJ file with a few regular expressions over the mapped file
+def obj_stats(data, stats):
+    stats["geometries"] = max(1, len(OBJ_GROUP.findall(data)))
+    stats["vertices"] = len(OBJ_VERTEX.findall(data))
+    for face in OBJ_FACE.finditer(data):
+        stats["polygons"] += 1
+        stats["triangles"] += len(face.group(1).split()) - 2
+    stats["materials"] = len(set(OBJ_MATERIAL.findall(data)))
+    uvs = [(float(u), float(v)) for u, v in OBJ_UV.findall(data)]
+    add_uv_bounds(stats, [u for u, v in uvs], [v for u, v in uvs])
+
+# Function to measure one mesh file through a read-only memory map
+def mesh_stats(path):
+    kind = os.path.splitext(path)[1].lower().lstrip('.')
+    size = os.path.getsize(path)
+    stats = empty_stats(path, kind, size)
+    if size == 0:
+        return stats
+    error = None
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        try:
+            if kind == 'fbx':
+                fbx_stats(data, stats)
+            else:
+                obj_stats(data, stats)
+        except (ValueError, zlib.error) as e:
+            # Keep only the message, so no traceback holds a view into the map when it closes
+            error = str(e)
+    if error is not None:
+        raise ValueError(error)
+    return stats
+
+def find_mesh_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                for file in sorted(files):
+                    if file.lower().endswith(MESH_EXTENSIONS):
+                        yield os.path.join(root, file)
+        else:
+            yield path
+
+def format_value(value):
+    return f"{value:.3f}" if isinstance(value, float) else ("-" if value is None else str(value))
+
+def print_table(rows, limit):
+    print(f"{'Triangles':>10}{'Vertices':>10}{'Materials':>10}  {'UV bounds':<36}Path")
+    for stats in rows[:limit] if limit else rows:
+        bounds = f"{format_value(stats['uv_min_u'])},{format_value(stats['uv_min_v'])} .. {format_value(stats['uv_max_u'])},{format_value(stats['uv_max_v'])}"
+        print(f"{stats['triangles']:>10}{stats['vertices']:>10}{stats['materials']:>10}  {bounds:<36}{stats['path']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="List the vertex, triangle, UV and material counts of FBX and OBJ meshes.")
+    parser.add_argument("paths", nargs="*", default=["Assets/Meshes"], help="mesh files, or directories searched recursively for them (default: Assets/Meshes)")
+    parser.add_argument("-n", "--top", type=int, default=20, help="rows to print, 0 for all (default: 20)")
+    parser.add_argument("--csv", metavar="FILE", help="write all rows as CSV to FILE")
+    parser.add_argument("--json", metavar="FILE", help="write all rows as JSON to FILE")
+    args = parser.parse_args()
+
+    rows = []
+    errors = 0
+    for path in find_mesh_files(args.paths):
+        try:
+            rows.append(mesh_stats(path))
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"Error processing file {path}: {e}")
+            errors += 1
+    rows.sort(key=lambda stats: (-stats["triangles"], stats["path"]))
+
+    print_table(rows, args.top)
+    print(f"{len(rows)} mesh(es), {sum(stats['triangles'] for stats in rows)} triangles in total")
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=4)
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import argparse
+import functools
+import json
+import os
+import re
+import sys
+
+# Sorts catalogs and manifests in natural order ("52002" before "52010", "1200.2"
+# before "1200.10"): the _list (or list) of a catalog by ID or Label, and the Files
+# of a .dfmod.json manifest by file name. Files already in order are not rewritten.
+
+NUMBER = re.compile(r'(\d+)')
+
+# Function to create a sorting key: the lowercased text split into text and numeric parts.
+# Each string is split once, however many comparisons it takes part in.
+@functools.lru_cache(maxsize=None)
+def natural_key(text):
+    return tuple(int(part) if part.isdigit() else part for part in NUMBER.split(text.lower()))
+
+# Function to find the list to sort in a file and the key for its items
+def sort_target(data, field):
+    if "Files" in data:
+        return "Files", lambda path: natural_key(os.path.basename(path))
+    for name in ("_list", "list"):
+        if name in data:
+            return name, lambda item: natural_key(str(item.get(field, "")))
+    raise ValueError("no Files, _list or list to sort")
+
+def is_sorted(keys):
+    return all(a <= b for a, b in zip(keys, keys[1:]))
+
+# Function to sort one file, returning the name of the sorted list, or None if it was already in order
+def sort_file(json_file, field, check=False):
+    with open(json_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    data = json.loads(text)
+    name, key = sort_target(data, field)
+    keys = [key(item) for item in data[name]]
+    if is_sorted(keys):
+        return None
+    if not check:
+        # sorted() is stable and compares the keys computed above, so items with equal keys keep their order
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        data[name] = [data[name][i] for i in order]
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4)
+            if text.endswith('\n'):
+                f.write('\n')
+    return name
+
+def main():
+    parser = argparse.ArgumentParser(description="Sort catalogs by ID or Label, and mod manifests by file name, in alphabetical and numeric order.")
+    parser.add_argument("files", nargs="+", help="catalog or .dfmod.json files")
+    parser.add_argument("-k", "--key", default="ID", help="catalog field to sort by, e.g. ID or Label (default: ID)")
+    parser.add_argument("--check", action="store_true", help="only report the files that are out of order")
+    args = parser.parse_args()
+
+    unsorted = 0
+    errors = 0
+    for json_file in args.files:
+        try:
+            name = sort_file(json_file, args.key, args.check)
+        except (OSError, ValueError) as e:
+            print(f"Error processing file {json_file}: {e}")
+            errors += 1
+            continue
+        if name is None:
+            print(f"{json_file} is already in order.")
+        elif args.check:
+            print(f"{json_file}: {name} is out of order.")
+            unsorted += 1
+        else:
+            field = "file name" if name == "Files" else f"'{args.key}' field"
+            print(f"Items in {json_file} have been rearranged in alphabetical and numeric order based on the {field}.")
+
+    if errors or unsorted:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
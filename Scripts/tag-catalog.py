@@ -0,0 +1,125 @@
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+
+# Sets the Tags of catalog entries from a table of rules. A rule matches an entry
+# when all of its conditions hold:
+#   "catalog"     file name pattern of the catalogs it applies to (default: all)
+#   "ids"         (first, last) range of model IDs, or of flat archives ("1200" of "1200.2")
+#   "id_suffix"   the ID ends with this text
+#   "category"    pattern for the Category, e.g. "Hills"
+#   "subcategory" pattern for the Subcategory, e.g. "* - Dirt"
+# The first matching rule sets the entry's Tags; entries no rule matches keep theirs.
+#
+# Only the Tags values are replaced in the file's text, so every catalog keeps its
+# own formatting, and files where no tag changed are not written.
+
+CATALOGS = ["rmbrp-models-catalog.json", "rmbrp-flats-catalog.json", "DET-models-catalog.json", "DET-flats-catalog.json"]
+
+RULES = [
+    # Hills come in dirt, grass and rock versions of every shape and size
+    {"catalog": "rmbrp-models-catalog.json", "category": "Hills", "subcategory": "* - Dirt", "tags": "dirt"},
+    {"catalog": "rmbrp-models-catalog.json", "category": "Hills", "subcategory": "* - Grass", "tags": "grass"},
+    {"catalog": "rmbrp-models-catalog.json", "category": "Hills", "subcategory": "* - Rock", "tags": "rock"},
+]
+
+# A "Tags" key and its string value, as written in the file
+TAGS_PATTERN = re.compile(r'("Tags"\s*:\s*)("(?:[^"\\]|\\.)*")')
+
+# Function to compile the rules that apply to one catalog into (test, tags) pairs
+def compile_rules(rules, catalog_name):
+    compiled = []
+    for rule in rules:
+        if not fnmatch.fnmatchcase(catalog_name, rule.get("catalog", "*")):
+            continue
+        tests = []
+        if "ids" in rule:
+            first, last = rule["ids"]
+            tests.append(lambda item, first=first, last=last: first <= id_number(item) <= last)
+        if "id_suffix" in rule:
+            tests.append(lambda item, suffix=rule["id_suffix"]: str(item.get("ID", "")).endswith(suffix))
+        for field in ("category", "subcategory"):
+            if field in rule:
+                pattern = re.compile(fnmatch.translate(rule[field]))
+                key = field.capitalize()
+                tests.append(lambda item, pattern=pattern, key=key: pattern.match(item.get(key, "")) is not None)
+        compiled.append((tests, rule["tags"]))
+    return compiled
+
+# Function to get the number an ID range is compared with: the model ID, or the archive of a flat
+def id_number(item):
+    try:
+        return int(str(item.get("ID", "")).split('.')[0])
+    except ValueError:
+        return -1
+
+def tags_for(item, compiled):
+    for tests, tags in compiled:
+        if all(test(item) for test in tests):
+            return tags
+    return None
+
+# Function to apply the rules to one catalog, returning the number of entries whose Tags changed
+def tag_catalog(json_file, rules, check=False):
+    with open(json_file, 'r', encoding='utf-8', newline='') as f:
+        text = f.read()
+    items = json.loads(text)["_list"]
+    compiled = compile_rules(rules, os.path.basename(json_file))
+    new_tags = [tags_for(item, compiled) if "Tags" in item else None for item in items]
+    if any(tags is not None for tags, item in zip(new_tags, items) if "Tags" not in item):
+        raise ValueError("entries without a Tags field")
+
+    # The Tags values appear in the text in the same order as the entries that have them
+    tagged = [tags for tags, item in zip(new_tags, items) if "Tags" in item]
+    matches = list(TAGS_PATTERN.finditer(text))
+    if len(matches) != len(tagged):
+        raise ValueError(f"found {len(matches)} Tags values in the text for {len(tagged)} entries")
+    changed = 0
+    parts = []
+    position = 0
+    for match, tags in zip(matches, tagged):
+        if tags is None or json.loads(match.group(2)) == tags:
+            continue
+        parts.append(text[position:match.start(2)])
+        parts.append(json.dumps(tags))
+        position = match.end(2)
+        changed += 1
+    if changed and not check:
+        parts.append(text[position:])
+        with open(json_file, 'w', encoding='utf-8', newline='') as f:
+            f.write(''.join(parts))
+    return changed
+
+def main():
+    parser = argparse.ArgumentParser(description="Set the Tags of catalog entries from the rules in this script.")
+    parser.add_argument("catalogs", nargs="*", help=f"catalog files (default: {', '.join(CATALOGS)} in the mod folder)")
+    parser.add_argument("--check", action="store_true", help="only report the catalogs whose tags are out of date")
+    args = parser.parse_args()
+
+    root = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    catalogs = args.catalogs or [os.path.join(root, name) for name in CATALOGS]
+    out_of_date = 0
+    errors = 0
+    for json_file in catalogs:
+        try:
+            changed = tag_catalog(json_file, RULES, args.check)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error processing file {json_file}: {e}")
+            errors += 1
+            continue
+        if not changed:
+            print(f"Tags in {json_file} are up to date.")
+        elif args.check:
+            print(f"{json_file}: {changed} entries need new tags.")
+            out_of_date += 1
+        else:
+            print(f"Tags updated in {json_file} successfully ({changed} entries).")
+
+    if errors or out_of_date:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()